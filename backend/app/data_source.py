@@ -3,9 +3,22 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional
+import logging
+import threading
 
 import duckdb
 
+logger = logging.getLogger("gtnh-data")
+
+_PARQUET_FILES = (
+    "recipes.parquet",
+    "item_inputs.parquet",
+    "item_outputs.parquet",
+    "fluid_inputs.parquet",
+    "fluid_outputs.parquet",
+)
+_WARM_READ_SIZE = 1 << 20
+
 
 @dataclass
 class DuckDBDataset:
@@ -18,6 +31,15 @@ class DuckDBDataset:
     def close(self) -> None:
         self.con.close()
 
+    def warm(self) -> None:
+        for name in _PARQUET_FILES:
+            path = self.data_dir / name
+            if not path.exists():
+                continue
+            with path.open("rb") as f:
+                while f.read(_WARM_READ_SIZE):
+                    pass
+
     def list_item_matches(self, query: str, limit: int) -> list[dict]:
         sql = """
             select distinct item_id, meta
@@ -83,28 +105,47 @@ class DuckDBDataset:
         }
 
     def recipe_inputs(self, rid: str) -> dict:
+        return self.recipe_inputs_bulk([rid])[rid]
+
+    def recipe_outputs(self, rid: str) -> dict:
+        return self.recipe_outputs_bulk([rid])[rid]
+
+    def recipe_ios_bulk(self, rids: list[str]) -> tuple[dict[str, dict], dict[str, dict]]:
+        return self.recipe_inputs_bulk(rids), self.recipe_outputs_bulk(rids)
+
+    def recipe_inputs_bulk(self, rids: list[str]) -> dict[str, dict]:
+        # One query per table for the whole page of recipes instead of one per rid.
+        grouped: dict[str, dict] = {rid: {"items": [], "fluids": []} for rid in rids}
+        if not grouped:
+            return grouped
+        rid_list = list(grouped)
+        placeholders = ", ".join("?" for _ in rid_list)
         items = self.con.execute(
-            """
-            select item_id, meta, count
+            f"""
+            select rid, item_id, meta, count
             from read_parquet(?)
-            where rid = ?
+            where rid in ({placeholders})
             """,
-            [str(self.data_dir / "item_inputs.parquet"), rid],
+            [str(self.data_dir / "item_inputs.parquet"), *rid_list],
         ).fetchall()
         fluids = self.con.execute(
-            """
-            select fluid_id, mb
+            f"""
+            select rid, fluid_id, mb
             from read_parquet(?)
-            where rid = ?
+            where rid in ({placeholders})
             """,
-            [str(self.data_dir / "fluid_inputs.parquet"), rid],
+            [str(self.data_dir / "fluid_inputs.parquet"), *rid_list],
         ).fetchall()
-        return {
-            "items": [{"item_id": r[0], "meta": int(r[1]), "count": int(r[2])} for r in items],
-            "fluids": [{"fluid_id": r[0], "mb": int(r[1])} for r in fluids],
-        }
-
-    def recipe_outputs(self, rid: str) -> dict:
+        for r in items:
+            grouped[r[0]]["items"].append({"item_id": r[1], "meta": int(r[2]), "count": int(r[3])})
+        for r in fluids:
+            grouped[r[0]]["fluids"].append({"fluid_id": r[1], "mb": int(r[2])})
+        return grouped
+
+    def recipe_outputs_bulk(self, rids: list[str]) -> dict[str, dict]:
+        grouped: dict[str, dict] = {rid: {"items": [], "fluids": []} for rid in rids}
+        if not grouped:
+            return grouped
         item_outputs_path = str(self.data_dir / "item_outputs.parquet")
         fluid_outputs_path = str(self.data_dir / "fluid_outputs.parquet")
         if self._item_outputs_has_chance is None:
@@ -120,62 +161,44 @@ class DuckDBDataset:
             except duckdb.Error:
                 self._fluid_outputs_has_chance = False
 
-        if self._item_outputs_has_chance:
-            items = self.con.execute(
-                """
-                select item_id, meta, count, chance
-                from read_parquet(?)
-                where rid = ?
-                """,
-                [item_outputs_path, rid],
-            ).fetchall()
-        else:
-            items = self.con.execute(
-                """
-                select item_id, meta, count
-                from read_parquet(?)
-                where rid = ?
-                """,
-                [item_outputs_path, rid],
-            ).fetchall()
-
-        if self._fluid_outputs_has_chance:
-            fluids = self.con.execute(
-                """
-                select fluid_id, mb, chance
-                from read_parquet(?)
-                where rid = ?
-                """,
-                [fluid_outputs_path, rid],
-            ).fetchall()
-        else:
-            fluids = self.con.execute(
-                """
-                select fluid_id, mb
-                from read_parquet(?)
-                where rid = ?
-                """,
-                [fluid_outputs_path, rid],
-            ).fetchall()
-        return {
-            "items": [
+        rid_list = list(grouped)
+        placeholders = ", ".join("?" for _ in rid_list)
+        item_chance = "chance" if self._item_outputs_has_chance else "null"
+        fluid_chance = "chance" if self._fluid_outputs_has_chance else "null"
+        items = self.con.execute(
+            f"""
+            select rid, item_id, meta, count, {item_chance}
+            from read_parquet(?)
+            where rid in ({placeholders})
+            """,
+            [item_outputs_path, *rid_list],
+        ).fetchall()
+        fluids = self.con.execute(
+            f"""
+            select rid, fluid_id, mb, {fluid_chance}
+            from read_parquet(?)
+            where rid in ({placeholders})
+            """,
+            [fluid_outputs_path, *rid_list],
+        ).fetchall()
+        for r in items:
+            grouped[r[0]]["items"].append(
                 {
-                    "item_id": r[0],
-                    "meta": int(r[1]),
-                    "count": int(r[2]),
-                    "chance": float(r[3]) if self._item_outputs_has_chance and r[3] is not None else None,
+                    "item_id": r[1],
+                    "meta": int(r[2]),
+                    "count": int(r[3]),
+                    "chance": float(r[4]) if r[4] is not None else None,
                 }
-                for r in items
-            ],
-            "fluids": [
+            )
+        for r in fluids:
+            grouped[r[0]]["fluids"].append(
                 {
-                    "fluid_id": r[0],
-                    "mb": int(r[1]),
-                    "chance": float(r[2]) if self._fluid_outputs_has_chance and r[2] is not None else None,
+                    "fluid_id": r[1],
+                    "mb": int(r[2]),
+                    "chance": float(r[3]) if r[3] is not None else None,
                 }
-                for r in fluids
-            ],
-        }
+            )
+        return grouped
 
     def recipes_for_output_item(self, item_id: str, meta: int, limit: int) -> list[dict]:
         sql = """
@@ -584,17 +607,112 @@ class DuckDBDataset:
             for r in rows
         ]
 
+    def recipes_for_machine_filtered(
+        self,
+        machine_id: str,
+        query: str,
+        item_keys: list[str],
+        fluid_ids: list[str],
+        limit: int,
+    ) -> list[dict]:
+        # Keeps recipes with an output whose id contains the lowercased query, or
+        # whose key is in item_keys ("item_id|meta") / fluid_ids, i.e. outputs the
+        # caller already matched by display name. The key lists are unnested into
+        # IN subqueries so DuckDB hashes them once instead of scanning the list
+        # for every output row, which matters for broad queries like "dust".
+        item_filter = "contains(lower(item_id), ?)"
+        item_params: list = [query]
+        if item_keys:
+            item_filter += " or printf('%s|%d', item_id, meta) in (select unnest(?))"
+            item_params.append(item_keys)
+        fluid_filter = "contains(lower(fluid_id), ?)"
+        fluid_params: list = [query]
+        if fluid_ids:
+            fluid_filter += " or fluid_id in (select unnest(?))"
+            fluid_params.append(fluid_ids)
+        sql = f"""
+            select rid, machine_id, duration_ticks, eut
+            from read_parquet(?)
+            where machine_id = ?
+            and (
+                rid in (select rid from read_parquet(?) where {item_filter})
+                or rid in (select rid from read_parquet(?) where {fluid_filter})
+            )
+            limit ?
+        """
+        rows = self.con.execute(
+            sql,
+            [
+                str(self.data_dir / "recipes.parquet"),
+                machine_id,
+                str(self.data_dir / "item_outputs.parquet"),
+                *item_params,
+                str(self.data_dir / "fluid_outputs.parquet"),
+                *fluid_params,
+                int(limit),
+            ],
+        ).fetchall()
+        return [
+            {
+                "rid": r[0],
+                "machine_id": r[1],
+                "duration_ticks": int(r[2]),
+                "eut": int(r[3]),
+            }
+            for r in rows
+        ]
+
 
 class DataSource:
+    def __init__(self) -> None:
+        # DuckDB connections must not be shared between threads, so every threadpool
+        # worker keeps one long-lived dataset per version instead of opening and
+        # closing a connection on each request. AnyIO retires idle worker threads, so
+        # handles owned by threads that have exited are closed when the next one is
+        # opened.
+        self._local = threading.local()
+        self._pooled: list[tuple[threading.Thread, DuckDBDataset]] = []
+        self._pooled_lock = threading.Lock()
+
     def list_versions(self) -> Iterable[str]:
         raise NotImplementedError
 
     def open_dataset(self, version: str) -> DuckDBDataset:
         raise NotImplementedError
 
+    def get_pooled(self, version: str) -> DuckDBDataset:
+        datasets = getattr(self._local, "datasets", None)
+        if datasets is None:
+            datasets = self._local.datasets = {}
+        dataset = datasets.get(version)
+        if dataset is None:
+            dataset = self.open_dataset(version)
+            datasets[version] = dataset
+            with self._pooled_lock:
+                stale = [entry for entry in self._pooled if not entry[0].is_alive()]
+                self._pooled[:] = [entry for entry in self._pooled if entry[0].is_alive()]
+                self._pooled.append((threading.current_thread(), dataset))
+            _close_datasets([entry[1] for entry in stale])
+        return dataset
+
+    def close_pooled(self) -> None:
+        with self._pooled_lock:
+            datasets = [entry[1] for entry in self._pooled]
+            self._pooled.clear()
+        _close_datasets(datasets)
+
+
+def _close_datasets(datasets: list[DuckDBDataset]) -> None:
+    for dataset in datasets:
+        try:
+            dataset.close()
+        except Exception:
+            logger.warning("Failed to close dataset %s", dataset.version)
+
 
 class LocalDataSource(DataSource):
     def __init__(self, data_dir: Path, default_version: str) -> None:
+        super().__init__()
         self.data_dir = data_dir
         self.default_version = default_version
 
@@ -605,12 +723,15 @@ class LocalDataSource(DataSource):
         if version != self.default_version:
             raise ValueError(f"Unknown version: {version}")
         con = duckdb.connect(database=":memory:")
+        # Pooled connections re-read the same Parquet files on every request; keep
+        # their footers and row-group metadata cached across queries.
+        con.execute("SET enable_object_cache = true")
         return DuckDBDataset(version=version, data_dir=self.data_dir, con=con)
 
 
 class S3DataSource(DataSource):
     def __init__(self, *args, **kwargs) -> None:
-        pass
+        super().__init__()
 
     def list_versions(self) -> Iterable[str]:
         raise NotImplementedError("S3 data source not implemented")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -12,6 +13,8 @@ import duckdb
 
 logger = logging.getLogger("ladybugdb")
 
+LOADED_SENTINEL = "_ladybug_loaded"
+
 SEARCH_ITEMS_CYPHER = """
 MATCH (i:Item)
 WHERE toLower(i.item_id) CONTAINS $query
@@ -129,6 +132,68 @@ RETURN r.rid AS rid, r.machine_id AS machine_id, r.duration_ticks AS duration_ti
 LIMIT $limit
 """.strip()
 
+LOAD_ITEM_NODES_CYPHER = (
+    "UNWIND $rows AS row "
+    "MERGE (i:Item {item_key: row.item_key}) "
+    "SET i.item_id = row.item_id, i.meta = row.meta"
+)
+LOAD_ITEM_NODE_CYPHER = "MERGE (i:Item {item_key: $item_key}) SET i.item_id = $item_id, i.meta = $meta"
+
+LOAD_FLUID_NODES_CYPHER = "UNWIND $rows AS row MERGE (f:Fluid {fluid_id: row.fluid_id})"
+LOAD_FLUID_NODE_CYPHER = "MERGE (f:Fluid {fluid_id: $fluid_id})"
+
+LOAD_RECIPE_NODES_CYPHER = (
+    "UNWIND $rows AS row "
+    "MERGE (r:Recipe {rid: row.rid}) "
+    "SET r.machine_id = row.machine_id, r.duration_ticks = row.duration_ticks, r.eut = row.eut"
+)
+LOAD_RECIPE_NODE_CYPHER = (
+    "MERGE (r:Recipe {rid: $rid}) "
+    "SET r.machine_id = $machine_id, r.duration_ticks = $duration_ticks, r.eut = $eut"
+)
+
+LOAD_INPUT_ITEM_RELS_CYPHER = (
+    "UNWIND $rows AS row "
+    "MATCH (r:Recipe {rid: row.rid}), (i:Item {item_key: row.item_key}) "
+    "MERGE (i)-[:INPUT_ITEM]->(r)"
+)
+LOAD_INPUT_ITEM_REL_CYPHER = (
+    "MATCH (r:Recipe {rid: $rid}), (i:Item {item_key: $item_key}) "
+    "MERGE (i)-[:INPUT_ITEM]->(r)"
+)
+
+LOAD_INPUT_FLUID_RELS_CYPHER = (
+    "UNWIND $rows AS row "
+    "MATCH (r:Recipe {rid: row.rid}), (f:Fluid {fluid_id: row.fluid_id}) "
+    "MERGE (f)-[:INPUT_FLUID]->(r)"
+)
+LOAD_INPUT_FLUID_REL_CYPHER = (
+    "MATCH (r:Recipe {rid: $rid}), (f:Fluid {fluid_id: $fluid_id}) "
+    "MERGE (f)-[:INPUT_FLUID]->(r)"
+)
+
+LOAD_OUTPUT_ITEM_RELS_CYPHER = (
+    "UNWIND $rows AS row "
+    "MATCH (r:Recipe {rid: row.rid}), (i:Item {item_key: row.item_key}) "
+    "MERGE (r)-[:OUTPUT_ITEM]->(i)"
+)
+LOAD_OUTPUT_ITEM_REL_CYPHER = (
+    "MATCH (r:Recipe {rid: $rid}), (i:Item {item_key: $item_key}) "
+    "MERGE (r)-[:OUTPUT_ITEM]->(i)"
+)
+
+LOAD_OUTPUT_FLUID_RELS_CYPHER = (
+    "UNWIND $rows AS row "
+    "MATCH (r:Recipe {rid: row.rid}), (f:Fluid {fluid_id: row.fluid_id}) "
+    "MERGE (r)-[:OUTPUT_FLUID]->(f)"
+)
+LOAD_OUTPUT_FLUID_REL_CYPHER = (
+    "MATCH (r:Recipe {rid: $rid}), (f:Fluid {fluid_id: $fluid_id}) "
+    "MERGE (r)-[:OUTPUT_FLUID]->(f)"
+)
+
+SET_META_CYPHER = "MERGE (m:Meta {key: $key}) SET m.value = $value"
+
 ItemKey = Tuple[str, int]
 
 
@@ -293,7 +358,17 @@ class GraphStore:
         return None
 
     def search_items(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        return self.query(SEARCH_ITEMS_CYPHER, {"query": query.lower(), "limit": int(limit)})
+        rows = self.query(SEARCH_ITEMS_CYPHER, {"query": query.lower(), "limit": int(limit)})
+        # Callers key results by (item_id, meta) against the name index, which
+        # stores meta as int; normalize once here rather than in every consumer.
+        results = []
+        for row in rows:
+            try:
+                meta = int(row.get("meta", 0))
+            except (TypeError, ValueError):
+                meta = 0
+            results.append({"item_id": row["item_id"], "meta": meta})
+        return results
 
     def search_fluids(self, query: str, limit: int) -> List[Dict[str, Any]]:
         return self.query(SEARCH_FLUIDS_CYPHER, {"query": query.lower(), "limit": int(limit)})
@@ -756,11 +831,14 @@ class LadybugGraphStore(GraphStore):
         self.data_dir = data_dir
         self._db = None
         self._conn = None
+        self._rows_impl: Optional[str] = None
+        self._prepared: Dict[str, Any] = {}
+        self._schema_ready = False
         self._create_graph()
         self._loaded = False
-        self._loading = False
-        self._load_error: Optional[Exception] = None
         self._lock = threading.Lock()
+        self._ready_lock = threading.Lock()
+        self._ready_future: Optional[Future] = None
 
     def _create_graph(self) -> None:
         try:
@@ -777,7 +855,7 @@ class LadybugGraphStore(GraphStore):
         self._db = ladybugdb.Database(db_path, max_num_threads=max_threads)
         self._conn = ladybugdb.Connection(self._db)
 
-    def _execute(self, cypher: str, params: Dict[str, Any]) -> Any:
+    def _execute(self, cypher: Any, params: Dict[str, Any]) -> Any:
         if self._conn is None:
             raise RuntimeError("LadybugDB connection is not initialized.")
         return self._conn.execute(cypher, params or {})
@@ -788,27 +866,39 @@ class LadybugGraphStore(GraphStore):
             return rows
         if isinstance(result, list):
             for part in result:
-                if hasattr(part, "rows_as_dict"):
-                    part.rows_as_dict()
-                    rows.extend(part.get_all())
+                rows.extend(self._result_rows(part))
             return rows
-        if hasattr(result, "rows_as_dict"):
-            result.rows_as_dict()
-            return result.get_all()
+        # The binding never changes for the life of the process, so resolve how
+        # to read a result once instead of probing every query.
+        rows_impl = self._rows_impl
+        if rows_impl is None:
+            rows_impl = "dict" if hasattr(result, "rows_as_dict") else "iter"
+            self._rows_impl = rows_impl
+        if rows_impl == "dict":
+            return result.rows_as_dict().get_all()
         try:
             return list(result)
         except TypeError:
             return rows
 
+    def _prepare(self, cypher: str) -> Any:
+        prepared = self._prepared.get(cypher)
+        if prepared is None:
+            prepare = getattr(self._conn, "prepare", None)
+            prepared = prepare(cypher) if prepare else cypher
+            self._prepared[cypher] = prepared
+        return prepared
+
     def _execute_rows(self, cypher: str, rows: List[Dict[str, Any]], per_row_cypher: str) -> None:
         if not rows:
             return
         try:
-            self._execute(cypher, {"rows": rows})
+            self._execute(self._prepare(cypher), {"rows": rows})
             return
         except Exception:
+            per_row = self._prepare(per_row_cypher)
             for row in rows:
-                self._execute(per_row_cypher, row)
+                self._execute(per_row, row)
 
     def _chunked(self, rows: Iterable[Dict[str, Any]], size: int = 1000) -> Iterable[List[Dict[str, Any]]]:
         chunk: List[Dict[str, Any]] = []
@@ -824,32 +914,20 @@ class LadybugGraphStore(GraphStore):
         if self._conn is None:
             raise RuntimeError("LadybugDB connection is not initialized.")
         self._ensure_schema()
-        item_rows = [{"item_id": item_id, "meta": meta} for _, item_id, meta in data.item_index]
-        for row in item_rows:
-            row["item_key"] = f"{row['item_id']}|{row['meta']}"
+        # Row dicts are produced lazily so only one chunk of parameter bags is
+        # alive at a time, rather than one dict per node/edge for the whole graph.
+        item_rows = (
+            {"item_id": item_id, "meta": meta, "item_key": f"{item_id}|{meta}"}
+            for _, item_id, meta in data.item_index
+        )
         for chunk in self._chunked(item_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MERGE (i:Item {item_key: row.item_key}) "
-                    "SET i.item_id = row.item_id, i.meta = row.meta"
-                ),
-                chunk,
-                (
-                    "MERGE (i:Item {item_key: $item_key}) "
-                    "SET i.item_id = $item_id, i.meta = $meta"
-                ),
-            )
+            self._execute_rows(LOAD_ITEM_NODES_CYPHER, chunk, LOAD_ITEM_NODE_CYPHER)
 
-        fluid_rows = [{"fluid_id": fluid_id} for _, fluid_id in data.fluid_index]
+        fluid_rows = ({"fluid_id": fluid_id} for _, fluid_id in data.fluid_index)
         for chunk in self._chunked(fluid_rows):
-            self._execute_rows(
-                "UNWIND $rows AS row MERGE (f:Fluid {fluid_id: row.fluid_id})",
-                chunk,
-                "MERGE (f:Fluid {fluid_id: $fluid_id})",
-            )
+            self._execute_rows(LOAD_FLUID_NODES_CYPHER, chunk, LOAD_FLUID_NODE_CYPHER)
 
-        recipe_rows = [
+        recipe_rows = (
             {
                 "rid": recipe["rid"],
                 "machine_id": recipe.get("machine_id"),
@@ -857,103 +935,52 @@ class LadybugGraphStore(GraphStore):
                 "eut": recipe.get("eut"),
             }
             for recipe in data.recipes.values()
-        ]
+        )
         for chunk in self._chunked(recipe_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MERGE (r:Recipe {rid: row.rid}) "
-                    "SET r.machine_id = row.machine_id, r.duration_ticks = row.duration_ticks, r.eut = row.eut"
-                ),
-                chunk,
-                (
-                    "MERGE (r:Recipe {rid: $rid}) "
-                    "SET r.machine_id = $machine_id, r.duration_ticks = $duration_ticks, r.eut = $eut"
-                ),
-            )
+            self._execute_rows(LOAD_RECIPE_NODES_CYPHER, chunk, LOAD_RECIPE_NODE_CYPHER)
 
-        item_input_rows = [
+        item_input_rows = (
             {"rid": rid, "item_id": item_id, "meta": meta, "item_key": f"{item_id}|{meta}"}
             for (item_id, meta), rids in data.item_input_map.items()
             for rid in rids
-        ]
+        )
         for chunk in self._chunked(item_input_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MATCH (r:Recipe {rid: row.rid}), (i:Item {item_key: row.item_key}) "
-                    "MERGE (i)-[:INPUT_ITEM]->(r)"
-                ),
-                chunk,
-                (
-                    "MATCH (r:Recipe {rid: $rid}), (i:Item {item_key: $item_key}) "
-                    "MERGE (i)-[:INPUT_ITEM]->(r)"
-                ),
-            )
+            self._execute_rows(LOAD_INPUT_ITEM_RELS_CYPHER, chunk, LOAD_INPUT_ITEM_REL_CYPHER)
 
-        fluid_input_rows = [
+        fluid_input_rows = (
             {"rid": rid, "fluid_id": fluid_id}
             for fluid_id, rids in data.fluid_input_map.items()
             for rid in rids
-        ]
+        )
         for chunk in self._chunked(fluid_input_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MATCH (r:Recipe {rid: row.rid}), (f:Fluid {fluid_id: row.fluid_id}) "
-                    "MERGE (f)-[:INPUT_FLUID]->(r)"
-                ),
-                chunk,
-                (
-                    "MATCH (r:Recipe {rid: $rid}), (f:Fluid {fluid_id: $fluid_id}) "
-                    "MERGE (f)-[:INPUT_FLUID]->(r)"
-                ),
-            )
+            self._execute_rows(LOAD_INPUT_FLUID_RELS_CYPHER, chunk, LOAD_INPUT_FLUID_REL_CYPHER)
 
-        item_output_rows = [
+        item_output_rows = (
             {"rid": rid, "item_id": item_id, "meta": meta, "item_key": f"{item_id}|{meta}"}
             for (item_id, meta), rids in data.item_output_map.items()
             for rid in rids
-        ]
+        )
         for chunk in self._chunked(item_output_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MATCH (r:Recipe {rid: row.rid}), (i:Item {item_key: row.item_key}) "
-                    "MERGE (r)-[:OUTPUT_ITEM]->(i)"
-                ),
-                chunk,
-                (
-                    "MATCH (r:Recipe {rid: $rid}), (i:Item {item_key: $item_key}) "
-                    "MERGE (r)-[:OUTPUT_ITEM]->(i)"
-                ),
-            )
+            self._execute_rows(LOAD_OUTPUT_ITEM_RELS_CYPHER, chunk, LOAD_OUTPUT_ITEM_REL_CYPHER)
 
-        fluid_output_rows = [
+        fluid_output_rows = (
             {"rid": rid, "fluid_id": fluid_id}
             for fluid_id, rids in data.fluid_output_map.items()
             for rid in rids
-        ]
+        )
         for chunk in self._chunked(fluid_output_rows):
-            self._execute_rows(
-                (
-                    "UNWIND $rows AS row "
-                    "MATCH (r:Recipe {rid: row.rid}), (f:Fluid {fluid_id: row.fluid_id}) "
-                    "MERGE (r)-[:OUTPUT_FLUID]->(f)"
-                ),
-                chunk,
-                (
-                    "MATCH (r:Recipe {rid: $rid}), (f:Fluid {fluid_id: $fluid_id}) "
-                    "MERGE (r)-[:OUTPUT_FLUID]->(f)"
-                ),
-            )
+            self._execute_rows(LOAD_OUTPUT_FLUID_RELS_CYPHER, chunk, LOAD_OUTPUT_FLUID_REL_CYPHER)
 
-        self._execute(
-            "MERGE (m:Meta {key: $key}) SET m.value = $value",
-            {"key": "loaded", "value": "true"},
-        )
+        self._execute(SET_META_CYPHER, {"key": "loaded", "value": "true"})
+
+    def _loaded_sentinel(self) -> Path:
+        return self.data_dir.parent / LOADED_SENTINEL
 
     def _maybe_reset_incomplete_db(self, db_path: Path) -> None:
+        # The sentinel is written only after a successful bulk import, so its
+        # presence is enough to skip opening the db just to peek at Meta.
+        if (db_path.parent / LOADED_SENTINEL).exists():
+            return
         try:
             import real_ladybug as ladybugdb  # type: ignore
         except ImportError:
@@ -969,10 +996,12 @@ class LadybugGraphStore(GraphStore):
             conn.close()
             db.close()
             if rows:
+                (db_path.parent / LOADED_SENTINEL).write_text("1")
                 return
             logger.warning("ladybugdb incomplete; resetting %s", db_path)
         except Exception:
             logger.warning("ladybugdb incomplete or unreadable; resetting %s", db_path)
+        self._schema_ready = False
         try:
             if db_path.is_dir():
                 shutil.rmtree(db_path)
@@ -981,6 +1010,23 @@ class LadybugGraphStore(GraphStore):
         except Exception as exc:
             logger.warning("ladybugdb reset failed: %s", exc)
 
+    def _run_staging(self, con: Any, stages: List[Tuple[str, str]]) -> None:
+        # Ladybug only admits one write transaction at a time, so the COPYs into
+        # the graph stay serial; the DuckDB staging queries are independent and
+        # run concurrently, each on its own cursor.
+        def _stage(stage: Tuple[str, str]) -> None:
+            label, sql = stage
+            logger.info("ladybugdb import: %s", label)
+            cursor = con.cursor()
+            try:
+                cursor.execute(sql)
+            finally:
+                cursor.close()
+
+        workers = max(1, min(len(stages), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ladybugdb-stage") as pool:
+            list(pool.map(_stage, stages))
+
     def _bulk_import_parquet(self) -> None:
         if self._conn is None:
             raise RuntimeError("LadybugDB connection is not initialized.")
@@ -988,156 +1034,153 @@ class LadybugGraphStore(GraphStore):
 
         import duckdb
 
+        sentinel = self._loaded_sentinel()
+        if sentinel.exists():
+            sentinel.unlink()
+
         stage_dir = self.data_dir / "_ladybug_import"
         if stage_dir.exists():
             shutil.rmtree(stage_dir, ignore_errors=True)
         stage_dir.mkdir(parents=True, exist_ok=True)
         con = duckdb.connect(database=":memory:")
 
-        def _path_sql(path: Path) -> str:
-            return str(path).replace("\\", "/").replace("'", "''")
-
-        item_nodes_path = _path_sql(stage_dir / "item_nodes.parquet")
-        fluid_nodes_path = _path_sql(stage_dir / "fluid_nodes.parquet")
-        recipe_nodes_path = _path_sql(stage_dir / "recipe_nodes.parquet")
-        input_item_path = _path_sql(stage_dir / "input_item.parquet")
-        input_fluid_path = _path_sql(stage_dir / "input_fluid.parquet")
-        output_item_path = _path_sql(stage_dir / "output_item.parquet")
-        output_fluid_path = _path_sql(stage_dir / "output_fluid.parquet")
-
-        item_inputs = _path_sql(self.data_dir / "item_inputs.parquet")
-        item_outputs = _path_sql(self.data_dir / "item_outputs.parquet")
-        fluid_inputs = _path_sql(self.data_dir / "fluid_inputs.parquet")
-        fluid_outputs = _path_sql(self.data_dir / "fluid_outputs.parquet")
-        recipes_path = _path_sql(self.data_dir / "recipes.parquet")
-
-        logger.info("ladybugdb import: staging item nodes")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    item_id || '|' || CAST(meta AS VARCHAR) AS item_key,
-                    item_id,
-                    CAST(meta AS BIGINT) AS meta
-                FROM (
-                    SELECT item_id, meta FROM read_parquet('{item_inputs}')
-                    UNION ALL
-                    SELECT item_id, meta FROM read_parquet('{item_outputs}')
-                )
-            ) TO '{item_nodes_path}' (FORMAT PARQUET)
-            """
-        )
-
-        logger.info("ladybugdb import: staging fluid nodes")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT fluid_id
-                FROM (
-                    SELECT fluid_id FROM read_parquet('{fluid_inputs}')
-                    UNION ALL
-                    SELECT fluid_id FROM read_parquet('{fluid_outputs}')
-                )
-            ) TO '{fluid_nodes_path}' (FORMAT PARQUET)
-            """
-        )
-
-        logger.info("ladybugdb import: staging recipe nodes")
-        con.execute(
-            f"""
-            COPY (
-                SELECT
-                    rid,
-                    MIN(machine_id) AS machine_id,
-                    CAST(MIN(duration_ticks) AS BIGINT) AS duration_ticks,
-                    CAST(MIN(eut) AS BIGINT) AS eut
-                FROM read_parquet('{recipes_path}')
-                GROUP BY rid
-            ) TO '{recipe_nodes_path}' (FORMAT PARQUET)
-            """
-        )
-
-        logger.info("ladybugdb import: staging output item rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    o.rid AS "from",
-                    item_id || '|' || CAST(meta AS VARCHAR) AS "to"
-                FROM read_parquet('{item_outputs}') o
-                JOIN read_parquet('{recipes_path}') r
-                ON o.rid = r.rid
-            ) TO '{output_item_path}' (FORMAT PARQUET)
-            """
-        )
-
-        logger.info("ladybugdb import: staging input item rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    item_id || '|' || CAST(meta AS VARCHAR) AS "from",
-                    i.rid AS "to"
-                FROM read_parquet('{item_inputs}') i
-                JOIN read_parquet('{recipes_path}') r
-                ON i.rid = r.rid
-            ) TO '{input_item_path}' (FORMAT PARQUET)
-            """
-        )
-
-        logger.info("ladybugdb import: staging output fluid rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    o.rid AS "from",
-                    fluid_id AS "to"
-                FROM read_parquet('{fluid_outputs}') o
-                JOIN read_parquet('{recipes_path}') r
-                ON o.rid = r.rid
-            ) TO '{output_fluid_path}' (FORMAT PARQUET)
-            """
-        )
+        paths = {
+            name: str(path).replace("\\", "/").replace("'", "''")
+            for name, path in (
+                ("item_nodes", stage_dir / "item_nodes.parquet"),
+                ("fluid_nodes", stage_dir / "fluid_nodes.parquet"),
+                ("recipe_nodes", stage_dir / "recipe_nodes.parquet"),
+                ("input_item", stage_dir / "input_item.parquet"),
+                ("input_fluid", stage_dir / "input_fluid.parquet"),
+                ("output_item", stage_dir / "output_item.parquet"),
+                ("output_fluid", stage_dir / "output_fluid.parquet"),
+                ("item_inputs", self.data_dir / "item_inputs.parquet"),
+                ("item_outputs", self.data_dir / "item_outputs.parquet"),
+                ("fluid_inputs", self.data_dir / "fluid_inputs.parquet"),
+                ("fluid_outputs", self.data_dir / "fluid_outputs.parquet"),
+                ("recipes", self.data_dir / "recipes.parquet"),
+            )
+        }
 
-        logger.info("ladybugdb import: staging input fluid rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    fluid_id AS "from",
-                    i.rid AS "to"
-                FROM read_parquet('{fluid_inputs}') i
-                JOIN read_parquet('{recipes_path}') r
-                ON i.rid = r.rid
-            ) TO '{input_fluid_path}' (FORMAT PARQUET)
-            """
-        )
+        stages = [
+            (
+                "staging item nodes",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        printf('%s|%d', item_id, meta) AS item_key,
+                        item_id,
+                        CAST(meta AS BIGINT) AS meta
+                    FROM (
+                        SELECT item_id, meta FROM read_parquet('{paths["item_inputs"]}')
+                        UNION ALL
+                        SELECT item_id, meta FROM read_parquet('{paths["item_outputs"]}')
+                    )
+                ) TO '{paths["item_nodes"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging fluid nodes",
+                f"""
+                COPY (
+                    SELECT DISTINCT fluid_id
+                    FROM (
+                        SELECT fluid_id FROM read_parquet('{paths["fluid_inputs"]}')
+                        UNION ALL
+                        SELECT fluid_id FROM read_parquet('{paths["fluid_outputs"]}')
+                    )
+                ) TO '{paths["fluid_nodes"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging recipe nodes",
+                f"""
+                COPY (
+                    SELECT
+                        rid,
+                        MIN(machine_id) AS machine_id,
+                        CAST(MIN(duration_ticks) AS BIGINT) AS duration_ticks,
+                        CAST(MIN(eut) AS BIGINT) AS eut
+                    FROM read_parquet('{paths["recipes"]}')
+                    GROUP BY rid
+                ) TO '{paths["recipe_nodes"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging output item rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        o.rid AS "from",
+                        printf('%s|%d', item_id, meta) AS "to"
+                    FROM read_parquet('{paths["item_outputs"]}') o
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON o.rid = r.rid
+                ) TO '{paths["output_item"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging input item rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        printf('%s|%d', item_id, meta) AS "from",
+                        i.rid AS "to"
+                    FROM read_parquet('{paths["item_inputs"]}') i
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON i.rid = r.rid
+                ) TO '{paths["input_item"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging output fluid rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        o.rid AS "from",
+                        fluid_id AS "to"
+                    FROM read_parquet('{paths["fluid_outputs"]}') o
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON o.rid = r.rid
+                ) TO '{paths["output_fluid"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging input fluid rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        fluid_id AS "from",
+                        i.rid AS "to"
+                    FROM read_parquet('{paths["fluid_inputs"]}') i
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON i.rid = r.rid
+                ) TO '{paths["input_fluid"]}' (FORMAT PARQUET)
+                """,
+            ),
+        ]
+        self._run_staging(con, stages)
 
         con.close()
 
         logger.info("ladybugdb import: COPY Item")
-        self._execute(f"COPY Item FROM '{item_nodes_path}'", {})
+        self._execute(f"COPY Item FROM '{paths['item_nodes']}'", {})
         logger.info("ladybugdb import: COPY Fluid")
-        self._execute(f"COPY Fluid FROM '{fluid_nodes_path}'", {})
+        self._execute(f"COPY Fluid FROM '{paths['fluid_nodes']}'", {})
         logger.info("ladybugdb import: COPY Recipe")
-        self._execute(f"COPY Recipe FROM '{recipe_nodes_path}'", {})
+        self._execute(f"COPY Recipe FROM '{paths['recipe_nodes']}'", {})
         logger.info("ladybugdb import: COPY INPUT_ITEM")
-        self._execute(f"COPY INPUT_ITEM FROM '{input_item_path}'", {})
+        self._execute(f"COPY INPUT_ITEM FROM '{paths['input_item']}'", {})
         logger.info("ladybugdb import: COPY INPUT_FLUID")
-        self._execute(f"COPY INPUT_FLUID FROM '{input_fluid_path}'", {})
+        self._execute(f"COPY INPUT_FLUID FROM '{paths['input_fluid']}'", {})
         logger.info("ladybugdb import: COPY OUTPUT_ITEM")
-        self._execute(f"COPY OUTPUT_ITEM FROM '{output_item_path}'", {})
+        self._execute(f"COPY OUTPUT_ITEM FROM '{paths['output_item']}'", {})
         logger.info("ladybugdb import: COPY OUTPUT_FLUID")
-        self._execute(f"COPY OUTPUT_FLUID FROM '{output_fluid_path}'", {})
+        self._execute(f"COPY OUTPUT_FLUID FROM '{paths['output_fluid']}'", {})
 
-        self._execute(
-            "MERGE (m:Meta {key: $key}) SET m.value = $value",
-            {"key": "loaded", "value": "true"},
-        )
-        self._execute(
-            "MERGE (m:Meta {key: $key}) SET m.value = $value",
-            {"key": "input_loaded", "value": "true"},
-        )
+        self._execute(SET_META_CYPHER, {"key": "loaded", "value": "true"})
+        self._execute(SET_META_CYPHER, {"key": "input_loaded", "value": "true"})
+        sentinel.write_text("1")
 
         try:
             shutil.rmtree(stage_dir)
@@ -1148,17 +1191,36 @@ class LadybugGraphStore(GraphStore):
         if not self._loaded:
             with self._lock:
                 if not self._loaded:
-                    self._loading = True
+                    if not self._has_data():
+                        self._bulk_import_parquet()
+                    self._loaded = True
+                    self._ensure_input_rels()
+
+    def _ready(self) -> Future:
+        # A single future is shared by every caller waiting on the load, so they
+        # all wake together when it finishes instead of queueing on self._lock.
+        # A failed load is retried by the next caller.
+        with self._ready_lock:
+            future = self._ready_future
+            if future is None or (future.done() and future.exception() is not None):
+                future = Future()
+                self._ready_future = future
+
+                def _runner() -> None:
                     try:
-                        if not self._has_data():
-                            self._bulk_import_parquet()
-                        self._loaded = True
-                        self._ensure_input_rels()
-                    finally:
-                        self._loading = False
+                        self._ensure_loaded()
+                    except Exception as exc:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(None)
+
+                thread = threading.Thread(target=_runner, name="ladybugdb-warmup", daemon=True)
+                thread.start()
+            return future
 
     def query(self, cypher: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self._ensure_loaded()
+        if not self._loaded:
+            self.wait_until_ready()
         logger.info("ladybugdb query: %s", cypher.splitlines()[0])
         result = self._execute(cypher, params)
         return self._result_rows(result)
@@ -1167,27 +1229,18 @@ class LadybugGraphStore(GraphStore):
         return self._loaded
 
     def warm_up(self) -> None:
-        if self._loaded or self._loading:
+        if self._loaded:
             return
-
-        def _runner() -> None:
-            try:
-                self._ensure_loaded()
-            except Exception as exc:
-                self._load_error = exc
-            finally:
-                self._loading = False
-
-        self._loading = True
-        thread = threading.Thread(target=_runner, name="ladybugdb-warmup", daemon=True)
-        thread.start()
+        self._ready()
 
     def wait_until_ready(self) -> None:
-        self._ensure_loaded()
-        if self._load_error:
-            raise self._load_error
+        if self._loaded:
+            return
+        self._ready().result()
 
     def _ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
         if self._conn is None:
             raise RuntimeError("LadybugDB connection is not initialized.")
         tables = self._execute("CALL show_tables() RETURN *;", {})
@@ -1225,6 +1278,7 @@ class LadybugGraphStore(GraphStore):
             self._execute("CREATE REL TABLE INPUT_ITEM(FROM Item TO Recipe)", {})
         if ("INPUT_FLUID", "REL") not in existing:
             self._execute("CREATE REL TABLE INPUT_FLUID(FROM Fluid TO Recipe)", {})
+        self._schema_ready = True
 
     def _has_data(self) -> bool:
         try:
@@ -1259,54 +1313,55 @@ class LadybugGraphStore(GraphStore):
         stage_dir.mkdir(parents=True, exist_ok=True)
         con = duckdb.connect(database=":memory:")
 
-        def _path_sql(path: Path) -> str:
-            return str(path).replace("\\", "/").replace("'", "''")
-
-        input_item_path = _path_sql(stage_dir / "input_item.parquet")
-        input_fluid_path = _path_sql(stage_dir / "input_fluid.parquet")
-        item_inputs = _path_sql(self.data_dir / "item_inputs.parquet")
-        fluid_inputs = _path_sql(self.data_dir / "fluid_inputs.parquet")
-        recipes_path = _path_sql(self.data_dir / "recipes.parquet")
-
-        logger.info("ladybugdb import: staging input item rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    item_id || '|' || CAST(meta AS VARCHAR) AS "from",
-                    i.rid AS "to"
-                FROM read_parquet('{item_inputs}') i
-                JOIN read_parquet('{recipes_path}') r
-                ON i.rid = r.rid
-            ) TO '{input_item_path}' (FORMAT PARQUET)
-            """
-        )
+        paths = {
+            name: str(path).replace("\\", "/").replace("'", "''")
+            for name, path in (
+                ("input_item", stage_dir / "input_item.parquet"),
+                ("input_fluid", stage_dir / "input_fluid.parquet"),
+                ("item_inputs", self.data_dir / "item_inputs.parquet"),
+                ("fluid_inputs", self.data_dir / "fluid_inputs.parquet"),
+                ("recipes", self.data_dir / "recipes.parquet"),
+            )
+        }
 
-        logger.info("ladybugdb import: staging input fluid rels")
-        con.execute(
-            f"""
-            COPY (
-                SELECT DISTINCT
-                    fluid_id AS "from",
-                    i.rid AS "to"
-                FROM read_parquet('{fluid_inputs}') i
-                JOIN read_parquet('{recipes_path}') r
-                ON i.rid = r.rid
-            ) TO '{input_fluid_path}' (FORMAT PARQUET)
-            """
-        )
+        stages = [
+            (
+                "staging input item rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        printf('%s|%d', item_id, meta) AS "from",
+                        i.rid AS "to"
+                    FROM read_parquet('{paths["item_inputs"]}') i
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON i.rid = r.rid
+                ) TO '{paths["input_item"]}' (FORMAT PARQUET)
+                """,
+            ),
+            (
+                "staging input fluid rels",
+                f"""
+                COPY (
+                    SELECT DISTINCT
+                        fluid_id AS "from",
+                        i.rid AS "to"
+                    FROM read_parquet('{paths["fluid_inputs"]}') i
+                    JOIN read_parquet('{paths["recipes"]}') r
+                    ON i.rid = r.rid
+                ) TO '{paths["input_fluid"]}' (FORMAT PARQUET)
+                """,
+            ),
+        ]
+        self._run_staging(con, stages)
 
         con.close()
 
         logger.info("ladybugdb import: COPY INPUT_ITEM")
-        self._execute(f"COPY INPUT_ITEM FROM '{input_item_path}'", {})
+        self._execute(f"COPY INPUT_ITEM FROM '{paths['input_item']}'", {})
         logger.info("ladybugdb import: COPY INPUT_FLUID")
-        self._execute(f"COPY INPUT_FLUID FROM '{input_fluid_path}'", {})
+        self._execute(f"COPY INPUT_FLUID FROM '{paths['input_fluid']}'", {})
 
-        self._execute(
-            "MERGE (m:Meta {key: $key}) SET m.value = $value",
-            {"key": "input_loaded", "value": "true"},
-        )
+        self._execute(SET_META_CYPHER, {"key": "input_loaded", "value": "true"})
 
         try:
             shutil.rmtree(stage_dir)
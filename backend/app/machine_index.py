@@ -77,30 +77,64 @@ def _select_best_bonus(entries: List[Dict[str, Any]]) -> Optional[MachineBonus]:
     return best
 
 
-def _load_parquet_entries(path: Path) -> List[Dict[str, Any]]:
+# Mirrors _entry_bonus/_entry_score/_select_best_bonus so DuckDB hands back one
+# already-normalized row per machine instead of every entry. Full ties keep the
+# earliest row in the file, as _select_best_bonus keeps the first entry.
+_BEST_BONUS_SQL = """
+    with raw as (
+        select
+            machine_id,
+            try_cast(speed_bonus as double) as speed_bonus,
+            try_cast(coil_bonus as double) as coil_bonus,
+            try_cast(parallel_bonus as double) as parallel_bonus,
+            try_cast(efficiency_bonus as double) as efficiency_bonus,
+            try_cast(max_parallel as double) as max_parallel,
+            file_row_number
+        from read_parquet(?, file_row_number = true)
+        where machine_id is not null and machine_id <> ''
+    ),
+    normalized as (
+        select
+            machine_id,
+            (case when speed_bonus > 0 then speed_bonus else 1.0 end)
+                * (case when coil_bonus > 0 then coil_bonus else 1.0 end) as speed_bonus,
+            case when parallel_bonus > 0 then parallel_bonus else 1.0 end as parallel_bonus,
+            case
+                when efficiency_bonus > 5 then efficiency_bonus / 100.0
+                when efficiency_bonus > 0 then efficiency_bonus
+                else 1.0
+            end as efficiency_bonus,
+            case when max_parallel > 0 then max_parallel end as max_parallel,
+            file_row_number
+        from raw
+    )
+    select machine_id, speed_bonus, efficiency_bonus, parallel_bonus, max_parallel
+    from normalized
+    qualify row_number() over (
+        partition by machine_id
+        order by
+            speed_bonus * coalesce(least(parallel_bonus, max_parallel), parallel_bonus) desc,
+            efficiency_bonus asc,
+            file_row_number asc
+    ) = 1
+"""
+
+
+def _load_parquet_bonuses(path: Path) -> Dict[str, MachineBonus]:
     if not path.exists():
-        return []
+        return {}
     con = duckdb.connect(database=":memory:")
-    rows = con.execute(
-        (
-            "select machine_id, parallel_bonus, max_parallel, speed_bonus, "
-            "efficiency_bonus, coil_bonus "
-            "from read_parquet(?)"
-        ),
-        [str(path)],
-    ).fetchall()
+    rows = con.execute(_BEST_BONUS_SQL, [str(path)]).fetchall()
     con.close()
-    return [
-        {
-            "machine_id": row[0],
-            "parallel_bonus": row[1],
-            "max_parallel": row[2],
-            "speed_bonus": row[3],
-            "efficiency_bonus": row[4],
-            "coil_bonus": row[5],
-        }
+    return {
+        row[0]: MachineBonus(
+            speed_bonus=row[1],
+            efficiency_bonus=row[2],
+            parallel_bonus=row[3],
+            max_parallel=row[4],
+        )
         for row in rows
-    ]
+    }
 
 
 def _load_json_entries(path: Path) -> List[Dict[str, Any]]:
@@ -124,9 +158,11 @@ def _load_json_entries(path: Path) -> List[Dict[str, Any]]:
 
 
 def load_machine_bonuses(machine_index_json: Path, data_dir: Path) -> Dict[str, MachineBonus]:
-    entries = _load_parquet_entries(data_dir / "machine_index.parquet")
-    if not entries:
-        entries = _load_json_entries(machine_index_json)
+    bonuses = _load_parquet_bonuses(data_dir / "machine_index.parquet")
+    if bonuses:
+        return bonuses
+
+    entries = _load_json_entries(machine_index_json)
     if not entries:
         return {}
 
@@ -136,7 +172,6 @@ def load_machine_bonuses(machine_index_json: Path, data_dir: Path) -> Dict[str,
         if machine_id:
             grouped[machine_id].append(entry)
 
-    bonuses: Dict[str, MachineBonus] = {}
     for machine_id, machine_entries in grouped.items():
         bonus = _select_best_bonus(machine_entries)
         if bonus:
@@ -1,26 +1,38 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import itertools
 import logging
+import logging.handlers
 import os
+import queue
+import sys
 from pathlib import Path
+from typing import Literal
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict
 
+from .cache import TTLCache, cached
 from .config import load_settings
-from .data_source import LocalDataSource, S3DataSource
-from .gtnh import MachineTuning, apply_machine_bonuses
+from .data_source import DuckDBDataset, LocalDataSource, S3DataSource
+from .gtnh import MachineBonus, MachineTuning, apply_machine_bonuses
 from .graph import GraphByproductTarget, GraphRequest, GraphTarget, build_graph
-from .graph_store import create_graph_store
+from .graph_store import GraphStore, create_graph_store
 from .machine_index import load_machine_bonuses
-from .name_index import load_name_index
+from .name_index import NameIndex, RecipeHeader, load_name_index
 
 settings = load_settings()
 logger = logging.getLogger("gtnh-api")
 
+access_logger = logging.getLogger("gtnh-api.access")
+_access_log_listener: logging.handlers.QueueListener | None = None
+
 if settings.data_source == "local":
     data_source = LocalDataSource(settings.local_data_dir, settings.default_version)
 elif settings.data_source == "s3":
@@ -28,15 +40,105 @@ elif settings.data_source == "s3":
 else:
     raise RuntimeError(f"Unsupported data source: {settings.data_source}")
 
-name_index = load_name_index(settings.recipes_json, settings.machine_index_json)
-machine_bonuses = load_machine_bonuses(settings.machine_index_json, settings.local_data_dir)
-graph_store = None
-if settings.data_source == "local":
-    graph_store = create_graph_store(settings.graph_backend, settings.local_data_dir)
-    if graph_store:
-        graph_store.wait_until_ready()
+# Built in the startup hook rather than at import, so a uvicorn supervisor
+# process (GTNH_API_WORKERS > 1) never loads the indexes or opens the graph store.
+name_index: NameIndex | None = None
+machine_bonuses: dict[str, MachineBonus] = {}
+graph_store: GraphStore | None = None
+# Identifies the source data behind every GET response; part of each ETag.
+_build_id = ""
+
+app = FastAPI(title="GTNH Production Planner API", default_response_class=ORJSONResponse)
+
+# Responses for the read-only lookup endpoints are pure functions of their query
+# parameters (the version is part of the key), so repeat lookups are served from
+# memory for a few minutes.
+_response_cache = TTLCache(maxsize=2048, ttl=300)
+# The UI re-posts identical graph requests while controls are tweaked; encoded
+# responses are keyed on the resolved version plus the canonical (sorted-key)
+# request body.
+_graph_cache = TTLCache(maxsize=256, ttl=600)
+# A recipe's enriched payload (bonuses, names, io) only changes with the data, so
+# it is shared by every list response that includes that rid. Entries are
+# read-only once cached.
+_enriched_recipe_cache = TTLCache(maxsize=16384, ttl=3600)
+
+
+# Covers the data files, this package's sources and the runtime settings, so a
+# deploy or restart that changes response shapes, ordering or the data backend
+# also changes every ETag.
+def _compute_build_id() -> str:
+    digest = hashlib.blake2b(repr(settings).encode())
+    for source in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    paths = [settings.recipes_json, settings.machine_index_json]
+    if settings.local_data_dir.exists():
+        paths.extend(sorted(settings.local_data_dir.rglob("*.parquet")))
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamp = f"{path}|-|-"
+        else:
+            stamp = f"{path}|{stat.st_mtime_ns}|{stat.st_size}"
+        digest.update(stamp.encode())
+    return digest.hexdigest()[:16]
+
+
+# Request lines are handed to a queue and written to stdout by a listener thread,
+# so the middleware never blocks on the stream lock. Set up from the startup hook:
+# `python -m app.main` imports this module twice and both copies share the logger.
+def _start_access_log() -> None:
+    global _access_log_listener
+    if access_logger.handlers:
+        return
+    if access_logger.level == logging.NOTSET:
+        access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    access_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    access_logger.addHandler(logging.handlers.QueueHandler(access_log_queue))
+    _access_log_listener = logging.handlers.QueueListener(
+        access_log_queue, logging.StreamHandler(sys.stdout)
+    )
+    _access_log_listener.start()
+
+
+def _stop_access_log() -> None:
+    global _access_log_listener
+    if _access_log_listener is None:
+        return
+    _access_log_listener.stop()
+    _access_log_listener = None
+    for handler in list(access_logger.handlers):
+        access_logger.removeHandler(handler)
+
+
+@app.on_event("startup")
+def load_indexes() -> None:
+    global name_index, machine_bonuses, graph_store, _build_id
+    _start_access_log()
+    _build_id = _compute_build_id()
+    name_index = load_name_index(settings.recipes_json, settings.machine_index_json)
+    machine_bonuses = load_machine_bonuses(settings.machine_index_json, settings.local_data_dir)
+    if settings.data_source == "local":
+        graph_store = create_graph_store(settings.graph_backend, settings.local_data_dir)
+        if graph_store:
+            graph_store.wait_until_ready()
+        # Handlers rely on the graph store being loaded here; also pull the Parquet
+        # files into the OS page cache so the first DuckDB queries are not cold.
+        for version in data_source.list_versions():
+            dataset = data_source.open_dataset(version)
+            try:
+                dataset.warm()
+            finally:
+                dataset.close()
+    # Cached responses were built from the previous indexes.
+    _response_cache.clear()
+    _graph_cache.clear()
+    _enriched_recipe_cache.clear()
+
 
-app = FastAPI(title="GTNH Production Planner API")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -46,13 +148,69 @@ app.add_middleware(
 )
 
 
+def _resolve_version(version: str | None) -> str:
+    return version or settings.default_version
+
+
+@functools.lru_cache(maxsize=256)
+def _tuning(overclock_tiers: int, parallel: int) -> MachineTuning:
+    return MachineTuning(overclock_tiers=overclock_tiers, parallel=parallel)
+
+
+def _get_dataset(version: str | None) -> DuckDBDataset:
+    return data_source.get_pooled(_resolve_version(version))
+
+
+@app.on_event("shutdown")
+def close_pooled_datasets() -> None:
+    data_source.close_pooled()
+    _stop_access_log()
+
+
+_SEARCH_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=60"
+
+
+def _etag_for(request: Request) -> str | None:
+    # GET responses are pure functions of the path, the query string and the
+    # loaded data, so the tag can be computed before the handler runs.
+    if request.method != "GET" or not request.url.path.startswith("/api/"):
+        return None
+    key = f"{_build_id}|{request.url.path}|{request.url.query}".encode()
+    return '"' + hashlib.blake2b(key, digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _cache_control_for(path: str) -> str:
+    return _SEARCH_CACHE_CONTROL if path.startswith("/api/search/") else "no-cache"
+
+
 @app.middleware("http")
 async def log_and_cors(request: Request, call_next):
-    try:
-        response = await call_next(request)
-    except Exception as exc:
-        logger.exception("Unhandled error on %s %s", request.method, request.url.path)
-        response = JSONResponse({"detail": "Internal server error"}, status_code=500)
+    etag = _etag_for(request)
+    if_none_match = request.headers.get("if-none-match")
+    if etag is not None and if_none_match and _etag_matches(if_none_match, etag):
+        response = Response(status_code=304)
+    else:
+        try:
+            response = await call_next(request)
+        except Exception as exc:
+            logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+            response = JSONResponse({"detail": "Internal server error"}, status_code=500)
+    if etag is not None and response.status_code in (200, 304):
+        response.headers["ETag"] = etag
+        response.headers.setdefault("Cache-Control", _cache_control_for(request.url.path))
     origin = request.headers.get("origin")
     if origin:
         response.headers.setdefault("Access-Control-Allow-Origin", origin)
@@ -61,11 +219,18 @@ async def log_and_cors(request: Request, call_next):
         response.headers.setdefault("Access-Control-Allow-Origin", "*")
     response.headers.setdefault("Access-Control-Allow-Methods", "*")
     response.headers.setdefault("Access-Control-Allow-Headers", "*")
-    print(f"{request.method} {request.url.path} -> {response.status_code}")
+    if access_logger.isEnabledFor(logging.INFO):
+        access_logger.info("%s %s -> %d", request.method, request.url.path, response.status_code)
     return response
 
 
+# Request bodies are never mutated after parsing; unknown keys are dropped.
+_REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
 class GraphTargetModel(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     target_type: str
     target_id: str
     target_meta: int = 0
@@ -74,6 +239,8 @@ class GraphTargetModel(BaseModel):
 
 
 class GraphByproductTargetModel(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     input_type: str
     input_id: str
     input_meta: int = 0
@@ -84,6 +251,8 @@ class GraphByproductTargetModel(BaseModel):
 
 
 class GraphRequestModel(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     version: str | None = None
     targets: list[GraphTargetModel] | None = None
     target_type: str = "item"
@@ -100,121 +269,184 @@ class GraphRequestModel(BaseModel):
     byproduct_targets: list[GraphByproductTargetModel] = []
 
 
+# Most machines have no bonus, so list handlers test membership in
+# machine_bonuses inline and only call this for the rows that need it.
 def apply_recipe_bonuses(recipe: dict) -> dict:
     bonus = machine_bonuses.get(recipe.get("machine_id"))
     if not bonus:
         return recipe
     duration_ticks, eut = apply_machine_bonuses(recipe["duration_ticks"], recipe["eut"], bonus)
-    return {
-        **recipe,
-        "base_duration_ticks": recipe["duration_ticks"],
-        "base_eut": recipe["eut"],
-        "duration_ticks": duration_ticks,
-        "eut": eut,
-    }
-
-
+    recipe["base_duration_ticks"] = recipe["duration_ticks"]
+    recipe["base_eut"] = recipe["eut"]
+    recipe["duration_ticks"] = duration_ticks
+    recipe["eut"] = eut
+    return recipe
+
+
+# Shared read-only default for missing lookups; never mutate.
+_EMPTY: dict = {}
+_NO_HEADER: RecipeHeader = (None, None, None, None, None)
+
+
+# Dataset and graph store rows are fresh per call, so names are attached in
+# place rather than copying every recipe and io dict.
+def _name_items(items: list[dict]) -> list[dict]:
+    names_by_id_get = name_index.items_by_id.get
+    for item in items:
+        item["name"] = names_by_id_get(item["item_id"], _EMPTY).get(item["meta"])
+    return items
+
+
+def _name_fluids(fluids: list[dict]) -> list[dict]:
+    fluids_get = name_index.fluids.get
+    for fluid in fluids:
+        fluid["name"] = fluids_get(fluid["fluid_id"])
+    return fluids
+
+
+def _enrich(recipe: dict, inputs: dict, outputs: dict, header: RecipeHeader | None) -> dict:
+    if header is None:
+        header = _NO_HEADER
+    machine_id = recipe.get("machine_id")
+    recipe["machine_name"] = header[0] or machine_id
+    recipe["machine_names_by_tier"] = name_index.machine_names_by_tier.get(machine_id, _EMPTY)
+    recipe["min_tier"] = header[1]
+    recipe["min_voltage"] = header[2]
+    recipe["amps"] = header[3]
+    recipe["ebf_temp"] = header[4]
+    recipe["item_inputs"] = _name_items(inputs["items"])
+    recipe["fluid_inputs"] = _name_fluids(inputs["fluids"])
+    recipe["item_outputs"] = _name_items(outputs["items"])
+    recipe["fluid_outputs"] = _name_fluids(outputs["fluids"])
+    return recipe
+
+
+def _enrich_recipes(dataset: DuckDBDataset, version: str, recipes: list[dict]) -> list[dict]:
+    enriched: list[dict | None] = []
+    missing = []
+    for recipe in recipes:
+        cached_recipe = _enriched_recipe_cache.get((version, recipe["rid"]))
+        enriched.append(cached_recipe)
+        if cached_recipe is None:
+            missing.append(recipe)
+    if not missing:
+        return enriched  # type: ignore[return-value]
+
+    inputs_by_rid, outputs_by_rid = dataset.recipe_ios_bulk([recipe["rid"] for recipe in missing])
+    recipe_header_get = name_index.recipe_headers.get
+    filled = iter(missing)
+    for index, cached_recipe in enumerate(enriched):
+        if cached_recipe is not None:
+            continue
+        recipe = next(filled)
+        rid = recipe["rid"]
+        if recipe["machine_id"] in machine_bonuses:
+            apply_recipe_bonuses(recipe)
+        enriched[index] = _enrich(recipe, inputs_by_rid[rid], outputs_by_rid[rid], recipe_header_get(rid))
+        _enriched_recipe_cache.set((version, rid), enriched[index])
+    return enriched  # type: ignore[return-value]
+
+
+# Handlers that touch DuckDB, ladybug or build_graph stay plain `def` so FastAPI
+# runs them in its threadpool; only handlers that never block are `async def`.
 @app.get("/api/versions")
-def list_versions():
+async def list_versions():
     return {"versions": list(data_source.list_versions())}
 
 
 @app.get("/api/search/items")
+@cached(_response_cache)
 def search_items(q: str, limit: int = 20, version: str | None = None):
+    # The UI's initial, empty search is served from the most-referenced items.
+    if not q:
+        top_items = name_index.top_items[:limit]
+        return {"items": _name_items([{"item_id": key[0], "meta": key[1]} for key in top_items])}
     if graph_store:
-        graph_store.wait_until_ready()
         results = graph_store.search_items(q, limit)
     else:
-        dataset = data_source.open_dataset(version or settings.default_version)
+        dataset = _get_dataset(version)
         results = dataset.list_item_matches(q, limit)
-        dataset.close()
 
-    normalized_results = []
+    q_lower = q.lower()
+    items_lower = name_index.items_lower
+    # Typeahead queries are usually prefixes: take those from the sorted prefix
+    # index (exact names sort first) and only fall back to substring matches
+    # when the prefix run does not fill the page.
+    exact_matches = []
+    prefix_matches = []
+    for key in itertools.islice(name_index.item_prefix.search(q_lower), limit):
+        if items_lower[key] == q_lower:
+            exact_matches.append(key)
+        else:
+            prefix_matches.append(key)
+    partial_matches = itertools.chain(prefix_matches, name_index.item_search.search(q_lower))
+    seen = set()
+    seen_add = seen.add
+    ordered_results: list[dict] = []
+    append = ordered_results.append
+    for key in exact_matches:
+        if key in seen:
+            continue
+        seen_add(key)
+        append({"item_id": key[0], "meta": key[1]})
     for item in results:
-        meta_value = item.get("meta", 0)
-        try:
-            meta_value = int(meta_value)
-        except (TypeError, ValueError):
-            meta_value = 0
-        normalized_results.append({**item, "meta": meta_value})
-    results = normalized_results
-
-    if q:
-        q_lower = q.lower()
-        name_matches = [
-            (item_id, meta, name)
-            for (item_id, meta), name in name_index.items.items()
-            if q_lower in name.lower()
-        ]
-        exact_matches = [
-            (item_id, meta)
-            for item_id, meta, name in name_matches
-            if name.lower() == q_lower
-        ]
-        partial_matches = [
-            (item_id, meta)
-            for item_id, meta, name in name_matches
-            if name.lower() != q_lower
-        ]
-        seen = set()
-        ordered_results: list[dict] = []
-        for item_id, meta in exact_matches:
-            if (item_id, meta) in seen:
-                continue
-            seen.add((item_id, meta))
-            ordered_results.append({"item_id": item_id, "meta": int(meta)})
-        for item in results:
-            key = (item["item_id"], int(item["meta"]))
+        key = (item["item_id"], item["meta"])
+        if key in seen:
+            continue
+        seen_add(key)
+        append(item)
+    # Only touch the substring index when exact and store matches leave room:
+    # pulling even the first candidate can mean verifying a long posting list.
+    count = len(ordered_results)
+    if count < limit:
+        for key in partial_matches:
             if key in seen:
                 continue
-            seen.add(key)
-            ordered_results.append(item)
-        for item_id, meta in partial_matches:
-            if (item_id, meta) in seen:
-                continue
-            seen.add((item_id, meta))
-            ordered_results.append({"item_id": item_id, "meta": int(meta)})
-            if len(ordered_results) >= limit:
+            seen_add(key)
+            append({"item_id": key[0], "meta": key[1]})
+            count += 1
+            if count >= limit:
                 break
-        results = ordered_results[:limit]
+    results = ordered_results[:limit]
 
-    enriched = []
-    for item in results:
-        name = name_index.items.get((item["item_id"], int(item.get("meta", 0))))
-        enriched.append({**item, "name": name})
-    return {"items": enriched}
+    return {"items": _name_items(results)}
 
 
 @app.get("/api/search/fluids")
+@cached(_response_cache)
 def search_fluids(q: str, limit: int = 20, version: str | None = None):
+    if not q:
+        return {"fluids": _name_fluids([{"fluid_id": key} for key in name_index.top_fluids[:limit]])}
     if graph_store:
-        graph_store.wait_until_ready()
         results = graph_store.search_fluids(q, limit)
     else:
-        dataset = data_source.open_dataset(version or settings.default_version)
+        dataset = _get_dataset(version)
         results = dataset.list_fluid_matches(q, limit)
-        dataset.close()
 
-    if q and len(results) < limit:
+    if len(results) < limit:
         q_lower = q.lower()
         seen = {fluid["fluid_id"] for fluid in results}
-        for fluid_id, name in name_index.fluids.items():
-            if q_lower in name.lower() and fluid_id not in seen:
-                results.append({"fluid_id": fluid_id})
-                seen.add(fluid_id)
-                if len(results) >= limit:
+        seen_add = seen.add
+        append = results.append
+        count = len(results)
+        for fluid_id in itertools.chain(
+            name_index.fluid_prefix.search(q_lower),
+            name_index.fluid_search.search(q_lower),
+        ):
+            if fluid_id not in seen:
+                append({"fluid_id": fluid_id})
+                seen_add(fluid_id)
+                count += 1
+                if count >= limit:
                     break
 
-    enriched = []
-    for fluid in results:
-        name = name_index.fluids.get(fluid["fluid_id"])
-        enriched.append({**fluid, "name": name})
-    return {"fluids": enriched}
+    return {"fluids": _name_fluids(results)}
 
 
 @app.get("/api/recipes/by-output")
+@cached(_response_cache)
 def recipes_by_output(
-    output_type: str,
+    output_type: Literal["item", "fluid"],
     item_id: str | None = None,
     meta: int = 0,
     fluid_id: str | None = None,
@@ -222,87 +454,27 @@ def recipes_by_output(
     limit: int = 10,
     version: str | None = None,
 ):
-    dataset = None
-    try:
-        recipes = None
-        if output_type == "item" and item_id:
-            if graph_store:
-                graph_store.wait_until_ready()
-                recipes = graph_store.recipes_by_output_item(item_id, meta, limit, machine_id)
-            else:
-                dataset = data_source.open_dataset(version or settings.default_version)
-                if machine_id:
-                    recipes = dataset.recipes_for_output_item_by_machine(item_id, meta, machine_id, limit)
-                else:
-                    recipes = dataset.recipes_for_output_item(item_id, meta, limit)
-        elif output_type == "fluid" and fluid_id:
-            if graph_store:
-                graph_store.wait_until_ready()
-                recipes = graph_store.recipes_by_output_fluid(fluid_id, limit, machine_id)
-            else:
-                dataset = data_source.open_dataset(version or settings.default_version)
-                if machine_id:
-                    recipes = dataset.recipes_for_output_fluid_by_machine(fluid_id, machine_id, limit)
-                else:
-                    recipes = dataset.recipes_for_output_fluid(fluid_id, limit)
+    # Reject an incomplete selector before a dataset connection is opened.
+    if not (item_id if output_type == "item" else fluid_id):
+        raise HTTPException(status_code=400, detail="Invalid output selector")
+
+    dataset = _get_dataset(version)
+    if output_type == "item":
+        if graph_store:
+            recipes = graph_store.recipes_by_output_item(item_id, meta, limit, machine_id)
+        elif machine_id:
+            recipes = dataset.recipes_for_output_item_by_machine(item_id, meta, machine_id, limit)
         else:
-            raise HTTPException(status_code=400, detail="Invalid output selector")
-
-        if recipes is None:
-            raise HTTPException(status_code=400, detail="Invalid output selector")
-
-        if dataset is None:
-            dataset = data_source.open_dataset(version or settings.default_version)
-
-        enriched = []
-        for recipe in recipes:
-            recipe = apply_recipe_bonuses(recipe)
-            info = name_index.recipes.get(recipe["rid"], {})
-            inputs = dataset.recipe_inputs(recipe["rid"])
-            outputs = dataset.recipe_outputs(recipe["rid"])
-            enriched.append(
-                {
-                    **recipe,
-                    "machine_name": info.get("machine_name") or recipe.get("machine_id"),
-                    "machine_names_by_tier": name_index.machine_names_by_tier.get(recipe.get("machine_id"), {}),
-                    "min_tier": info.get("min_tier"),
-                    "min_voltage": info.get("min_voltage"),
-                    "amps": info.get("amps"),
-                    "ebf_temp": info.get("ebf_temp"),
-                    "item_inputs": [
-                        {
-                            **item,
-                            "name": name_index.items.get((item["item_id"], item["meta"])),
-                        }
-                        for item in inputs["items"]
-                    ],
-                    "fluid_inputs": [
-                        {
-                            **fluid,
-                            "name": name_index.fluids.get(fluid["fluid_id"]),
-                        }
-                        for fluid in inputs["fluids"]
-                    ],
-                    "item_outputs": [
-                        {
-                            **item,
-                            "name": name_index.items.get((item["item_id"], item["meta"])),
-                        }
-                        for item in outputs["items"]
-                    ],
-                    "fluid_outputs": [
-                        {
-                            **fluid,
-                            "name": name_index.fluids.get(fluid["fluid_id"]),
-                        }
-                        for fluid in outputs["fluids"]
-                    ],
-                }
-            )
-        return {"recipes": enriched}
-    finally:
-        if dataset is not None:
-            dataset.close()
+            recipes = dataset.recipes_for_output_item(item_id, meta, limit)
+    else:
+        if graph_store:
+            recipes = graph_store.recipes_by_output_fluid(fluid_id, limit, machine_id)
+        elif machine_id:
+            recipes = dataset.recipes_for_output_fluid_by_machine(fluid_id, machine_id, limit)
+        else:
+            recipes = dataset.recipes_for_output_fluid(fluid_id, limit)
+
+    return {"recipes": _enrich_recipes(dataset, _resolve_version(version), recipes)}
 
 
 @app.get("/api/recipes/by-input")
@@ -320,184 +492,123 @@ def recipes_by_input(
     max_depth: int = 5,
     version: str | None = None,
 ):
-    dataset = None
-    try:
-        recipes = None
-        if input_type == "item" and item_id:
-            if downstream_type:
-                if not graph_store:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Downstream filtering requires GRAPH_DB=ladybugdb.",
-                    )
-                graph_store.wait_until_ready()
-                if downstream_type == "item" and downstream_item_id:
-                    recipes = graph_store.recipes_by_input_item_downstream(
-                        item_id,
-                        meta,
-                        downstream_type,
-                        downstream_item_id,
-                        downstream_meta,
-                        max_depth,
-                        limit,
-                        machine_id,
-                    )
-                elif downstream_type == "fluid" and downstream_fluid_id:
-                    recipes = graph_store.recipes_by_input_item_downstream(
-                        item_id,
-                        meta,
-                        downstream_type,
-                        downstream_fluid_id,
-                        downstream_meta,
-                        max_depth,
-                        limit,
-                        machine_id,
-                    )
-                else:
-                    raise HTTPException(status_code=400, detail="Invalid downstream selector")
+    dataset = _get_dataset(version)
+    recipes = None
+    if input_type == "item" and item_id:
+        if downstream_type:
+            if not graph_store:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Downstream filtering requires GRAPH_DB=ladybugdb.",
+                )
+            if downstream_type == "item" and downstream_item_id:
+                recipes = graph_store.recipes_by_input_item_downstream(
+                    item_id,
+                    meta,
+                    downstream_type,
+                    downstream_item_id,
+                    downstream_meta,
+                    max_depth,
+                    limit,
+                    machine_id,
+                )
+            elif downstream_type == "fluid" and downstream_fluid_id:
+                recipes = graph_store.recipes_by_input_item_downstream(
+                    item_id,
+                    meta,
+                    downstream_type,
+                    downstream_fluid_id,
+                    downstream_meta,
+                    max_depth,
+                    limit,
+                    machine_id,
+                )
             else:
-                if graph_store:
-                    graph_store.wait_until_ready()
-                    recipes = graph_store.recipes_by_input_item(item_id, meta, limit, machine_id)
-                else:
-                    dataset = data_source.open_dataset(version or settings.default_version)
-                    if machine_id:
-                        recipes = dataset.recipes_for_input_item_by_machine(
-                            item_id, meta, machine_id, limit
-                        )
-                    else:
-                        recipes = dataset.recipes_for_input_item(item_id, meta, limit)
-        elif input_type == "fluid" and fluid_id:
-            if downstream_type:
-                if not graph_store:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Downstream filtering requires GRAPH_DB=ladybugdb.",
-                    )
-                graph_store.wait_until_ready()
-                if downstream_type == "item" and downstream_item_id:
-                    recipes = graph_store.recipes_by_input_fluid_downstream(
-                        fluid_id,
-                        downstream_type,
-                        downstream_item_id,
-                        downstream_meta,
-                        max_depth,
-                        limit,
-                        machine_id,
-                    )
-                elif downstream_type == "fluid" and downstream_fluid_id:
-                    recipes = graph_store.recipes_by_input_fluid_downstream(
-                        fluid_id,
-                        downstream_type,
-                        downstream_fluid_id,
-                        downstream_meta,
-                        max_depth,
-                        limit,
-                        machine_id,
-                    )
-                else:
-                    raise HTTPException(status_code=400, detail="Invalid downstream selector")
+                raise HTTPException(status_code=400, detail="Invalid downstream selector")
+        else:
+            if graph_store:
+                recipes = graph_store.recipes_by_input_item(item_id, meta, limit, machine_id)
+            elif machine_id:
+                recipes = dataset.recipes_for_input_item_by_machine(
+                    item_id, meta, machine_id, limit
+                )
+            else:
+                recipes = dataset.recipes_for_input_item(item_id, meta, limit)
+    elif input_type == "fluid" and fluid_id:
+        if downstream_type:
+            if not graph_store:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Downstream filtering requires GRAPH_DB=ladybugdb.",
+                )
+            if downstream_type == "item" and downstream_item_id:
+                recipes = graph_store.recipes_by_input_fluid_downstream(
+                    fluid_id,
+                    downstream_type,
+                    downstream_item_id,
+                    downstream_meta,
+                    max_depth,
+                    limit,
+                    machine_id,
+                )
+            elif downstream_type == "fluid" and downstream_fluid_id:
+                recipes = graph_store.recipes_by_input_fluid_downstream(
+                    fluid_id,
+                    downstream_type,
+                    downstream_fluid_id,
+                    downstream_meta,
+                    max_depth,
+                    limit,
+                    machine_id,
+                )
             else:
-                if graph_store:
-                    graph_store.wait_until_ready()
-                    recipes = graph_store.recipes_by_input_fluid(fluid_id, limit, machine_id)
-                else:
-                    dataset = data_source.open_dataset(version or settings.default_version)
-                    if machine_id:
-                        recipes = dataset.recipes_for_input_fluid_by_machine(
-                            fluid_id, machine_id, limit
-                        )
-                    else:
-                        recipes = dataset.recipes_for_input_fluid(fluid_id, limit)
+                raise HTTPException(status_code=400, detail="Invalid downstream selector")
         else:
-            raise HTTPException(status_code=400, detail="Invalid input selector")
-
-        if recipes is None:
-            raise HTTPException(status_code=400, detail="Invalid input selector")
-
-        if dataset is None:
-            dataset = data_source.open_dataset(version or settings.default_version)
-
-        enriched = []
-        for recipe in recipes:
-            recipe = apply_recipe_bonuses(recipe)
-            info = name_index.recipes.get(recipe["rid"], {})
-            inputs = dataset.recipe_inputs(recipe["rid"])
-            outputs = dataset.recipe_outputs(recipe["rid"])
-            enriched.append(
-                {
-                    **recipe,
-                    "machine_name": info.get("machine_name") or recipe.get("machine_id"),
-                    "machine_names_by_tier": name_index.machine_names_by_tier.get(recipe.get("machine_id"), {}),
-                    "min_tier": info.get("min_tier"),
-                    "min_voltage": info.get("min_voltage"),
-                    "amps": info.get("amps"),
-                    "ebf_temp": info.get("ebf_temp"),
-                    "item_inputs": [
-                        {
-                            **item,
-                            "name": name_index.items.get((item["item_id"], item["meta"])),
-                        }
-                        for item in inputs["items"]
-                    ],
-                    "fluid_inputs": [
-                        {
-                            **fluid,
-                            "name": name_index.fluids.get(fluid["fluid_id"]),
-                        }
-                        for fluid in inputs["fluids"]
-                    ],
-                    "item_outputs": [
-                        {
-                            **item,
-                            "name": name_index.items.get((item["item_id"], item["meta"])),
-                        }
-                        for item in outputs["items"]
-                    ],
-                    "fluid_outputs": [
-                        {
-                            **fluid,
-                            "name": name_index.fluids.get(fluid["fluid_id"]),
-                        }
-                        for fluid in outputs["fluids"]
-                    ],
-                }
-            )
-        return {"recipes": enriched}
-    finally:
-        if dataset is not None:
-            dataset.close()
+            if graph_store:
+                recipes = graph_store.recipes_by_input_fluid(fluid_id, limit, machine_id)
+            elif machine_id:
+                recipes = dataset.recipes_for_input_fluid_by_machine(
+                    fluid_id, machine_id, limit
+                )
+            else:
+                recipes = dataset.recipes_for_input_fluid(fluid_id, limit)
+    else:
+        raise HTTPException(status_code=400, detail="Invalid input selector")
+
+    if recipes is None:
+        raise HTTPException(status_code=400, detail="Invalid input selector")
+
+    return {"recipes": _enrich_recipes(dataset, _resolve_version(version), recipes)}
 
 
 @app.get("/api/machines/by-output")
+@cached(_response_cache)
 def machines_by_output(
-    output_type: str,
+    output_type: Literal["item", "fluid"],
     item_id: str | None = None,
     meta: int = 0,
     fluid_id: str | None = None,
     limit: int = 200,
     version: str | None = None,
 ):
-    machine_rows = None
-    if output_type == "item" and item_id:
+    if not (item_id if output_type == "item" else fluid_id):
+        raise HTTPException(status_code=400, detail="Invalid output selector")
+
+    if output_type == "item":
         if graph_store:
-            graph_store.wait_until_ready()
             machine_rows = graph_store.machine_counts_by_output_item(item_id, meta, limit)
         else:
-            dataset = data_source.open_dataset(version or settings.default_version)
+            dataset = _get_dataset(version)
             machine_rows = dataset.machine_recipe_counts_for_output_item(item_id, meta, limit)
-            dataset.close()
-    elif output_type == "fluid" and fluid_id:
+    else:
         if graph_store:
-            graph_store.wait_until_ready()
             machine_rows = graph_store.machine_counts_by_output_fluid(fluid_id, limit)
         else:
-            dataset = data_source.open_dataset(version or settings.default_version)
+            dataset = _get_dataset(version)
             machine_rows = dataset.machine_recipe_counts_for_output_fluid(fluid_id, limit)
-            dataset.close()
-    else:
-        raise HTTPException(status_code=400, detail="Invalid output selector")
 
+    machine_names_get = name_index.machine_names.get
+    tier_names_get = name_index.machine_names_by_tier.get
     machines = []
     for row in machine_rows or []:
         machine_id = row.get("machine_id")
@@ -505,8 +616,8 @@ def machines_by_output(
         machines.append(
             {
                 "machine_id": machine_id,
-                "machine_name": name_index.machine_names.get(machine_id, machine_id),
-                "machine_names_by_tier": name_index.machine_names_by_tier.get(machine_id, {}),
+                "machine_name": machine_names_get(machine_id, machine_id),
+                "machine_names_by_tier": tier_names_get(machine_id, _EMPTY),
                 "recipe_count": int(recipe_count) if recipe_count is not None else None,
             }
         )
@@ -525,23 +636,21 @@ def machines_by_input(
     machine_rows = None
     if input_type == "item" and item_id:
         if graph_store:
-            graph_store.wait_until_ready()
             machine_rows = graph_store.machine_counts_by_input_item(item_id, meta, limit)
         else:
-            dataset = data_source.open_dataset(version or settings.default_version)
+            dataset = _get_dataset(version)
             machine_rows = dataset.machine_recipe_counts_for_input_item(item_id, meta, limit)
-            dataset.close()
     elif input_type == "fluid" and fluid_id:
         if graph_store:
-            graph_store.wait_until_ready()
             machine_rows = graph_store.machine_counts_by_input_fluid(fluid_id, limit)
         else:
-            dataset = data_source.open_dataset(version or settings.default_version)
+            dataset = _get_dataset(version)
             machine_rows = dataset.machine_recipe_counts_for_input_fluid(fluid_id, limit)
-            dataset.close()
     else:
         raise HTTPException(status_code=400, detail="Invalid input selector")
 
+    machine_names_get = name_index.machine_names.get
+    tier_names_get = name_index.machine_names_by_tier.get
     machines = []
     for row in machine_rows or []:
         machine_id = row.get("machine_id")
@@ -549,8 +658,8 @@ def machines_by_input(
         machines.append(
             {
                 "machine_id": machine_id,
-                "machine_name": name_index.machine_names.get(machine_id, machine_id),
-                "machine_names_by_tier": name_index.machine_names_by_tier.get(machine_id, {}),
+                "machine_name": machine_names_get(machine_id, machine_id),
+                "machine_names_by_tier": tier_names_get(machine_id, _EMPTY),
                 "recipe_count": int(recipe_count) if recipe_count is not None else None,
             }
         )
@@ -558,19 +667,20 @@ def machines_by_input(
 
 
 @app.get("/api/machines")
+@cached(_response_cache)
 def list_machines(version: str | None = None):
-    dataset = data_source.open_dataset(version or settings.default_version)
+    dataset = _get_dataset(version)
     machine_ids = dataset.list_machines()
-    dataset.close()
-    machines = []
-    for machine_id in machine_ids:
-        machines.append(
-            {
-                "machine_id": machine_id,
-                "machine_name": name_index.machine_names.get(machine_id, machine_id),
-                "machine_names_by_tier": name_index.machine_names_by_tier.get(machine_id, {}),
-            }
-        )
+    machine_names_get = name_index.machine_names.get
+    tier_names_get = name_index.machine_names_by_tier.get
+    machines = [
+        {
+            "machine_id": machine_id,
+            "machine_name": machine_names_get(machine_id, machine_id),
+            "machine_names_by_tier": tier_names_get(machine_id, _EMPTY),
+        }
+        for machine_id in machine_ids
+    ]
     return {"machines": machines}
 
 
@@ -581,77 +691,36 @@ def recipes_by_machine(
     q: str | None = None,
     version: str | None = None,
 ):
-    dataset = data_source.open_dataset(version or settings.default_version)
-    q_lower = q.lower() if q else None
-    results = []
-    raw_recipes = dataset.recipes_for_machine(machine_id, limit if not q else limit * 5)
-    for recipe in raw_recipes:
-        recipe = apply_recipe_bonuses(recipe)
-        info = name_index.recipes.get(recipe["rid"], {})
-        inputs = dataset.recipe_inputs(recipe["rid"])
-        outputs = dataset.recipe_outputs(recipe["rid"])
-        item_outputs = [
-            {
-                **item,
-                "name": name_index.items.get((item["item_id"], item["meta"])),
-            }
-            for item in outputs["items"]
-        ]
-        fluid_outputs = [
-            {
-                **fluid,
-                "name": name_index.fluids.get(fluid["fluid_id"]),
-            }
-            for fluid in outputs["fluids"]
-        ]
-        if q_lower:
-            def _match_output(output: dict, key: str) -> bool:
-                name = (output.get("name") or output.get(key) or "").lower()
-                return q_lower in name
-
-            if not (
-                any(_match_output(item, "item_id") for item in item_outputs)
-                or any(_match_output(fluid, "fluid_id") for fluid in fluid_outputs)
-            ):
-                continue
-
-        results.append(
-            {
-                **recipe,
-                "machine_name": info.get("machine_name") or recipe.get("machine_id"),
-                "machine_names_by_tier": name_index.machine_names_by_tier.get(recipe.get("machine_id"), {}),
-                "min_tier": info.get("min_tier"),
-                "min_voltage": info.get("min_voltage"),
-                "amps": info.get("amps"),
-                "ebf_temp": info.get("ebf_temp"),
-                "item_inputs": [
-                    {
-                        **item,
-                        "name": name_index.items.get((item["item_id"], item["meta"])),
-                    }
-                    for item in inputs["items"]
-                ],
-                "fluid_inputs": [
-                    {
-                        **fluid,
-                        "name": name_index.fluids.get(fluid["fluid_id"]),
-                    }
-                    for fluid in inputs["fluids"]
-                ],
-                "item_outputs": item_outputs,
-                "fluid_outputs": fluid_outputs,
-            }
-        )
-        if len(results) >= limit:
-            break
-    dataset.close()
-    return {"recipes": results}
+    # The encoded body is cached rather than the dict, so hits skip serialization.
+    cache_key = ("recipes_by_machine", machine_id, limit, q, _resolve_version(version))
+    body = _response_cache.get(cache_key)
+    if body is not None:
+        return Response(body, media_type="application/json")
+    dataset = _get_dataset(version)
+    if q:
+        # Output names only exist in the name index, so resolve them to keys here and
+        # let the dataset filter by id substring or key.
+        q_lower = q.lower()
+        item_keys = [f"{item_id}|{meta}" for item_id, meta in name_index.item_search.search(q_lower)]
+        fluid_ids = list(name_index.fluid_search.search(q_lower))
+        raw_recipes = dataset.recipes_for_machine_filtered(machine_id, q_lower, item_keys, fluid_ids, limit)
+    else:
+        raw_recipes = dataset.recipes_for_machine(machine_id, limit)
+    enriched = _enrich_recipes(dataset, _resolve_version(version), raw_recipes)
+    body = orjson.dumps({"recipes": enriched})
+    _response_cache.set(cache_key, body)
+    return Response(body, media_type="application/json")
 
 
 @app.post("/api/graph")
 def graph(req: GraphRequestModel):
-    dataset = data_source.open_dataset(req.version or settings.default_version)
-    tuning = MachineTuning(overclock_tiers=req.overclock_tiers, parallel=req.parallel)
+    version = _resolve_version(req.version)
+    cache_key = (version, orjson.dumps(req.model_dump(exclude={"version"}), option=orjson.OPT_SORT_KEYS))
+    body = _graph_cache.get(cache_key)
+    if body is not None:
+        return Response(body, media_type="application/json")
+    dataset = _get_dataset(version)
+    tuning = _tuning(req.overclock_tiers, req.parallel)
     if req.targets:
         targets = [
             GraphTarget(
@@ -665,7 +734,6 @@ def graph(req: GraphRequestModel):
         ]
     else:
         if not req.target_id:
-            dataset.close()
             raise HTTPException(status_code=400, detail="Missing target")
         targets = [
             GraphTarget(
@@ -689,7 +757,7 @@ def graph(req: GraphRequestModel):
         for target in (req.byproduct_targets or [])
     ]
     graph_req = GraphRequest(
-        version=req.version or settings.default_version,
+        version=version,
         targets=targets,
         max_depth=req.max_depth,
         tuning=tuning,
@@ -699,18 +767,39 @@ def graph(req: GraphRequestModel):
         byproduct_targets=byproduct_targets,
     )
     result = build_graph(dataset, name_index, graph_req, machine_bonuses)
-    dataset.close()
-    return result
+    body = orjson.dumps(result)
+    _graph_cache.set(cache_key, body)
+    return Response(body, media_type="application/json")
+
+
+class CachedStaticFiles(StaticFiles):
+    # Vite fingerprints everything under assets/, so those files never change at a
+    # given URL; index.html and other entry files must be revalidated on each load.
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if Path(full_path).parent.name == "assets":
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
 
 
 # Mount built frontend if present.
 static_dir = Path("frontend/dist")
 if static_dir.exists():
-    app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
+    app.mount("/", CachedStaticFiles(directory=static_dir, html=True), name="static")
 
 
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("GTNH_API_PORT", "8000"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # The ladybug graph store is an embedded database that a single process owns,
+    # so extra workers are opt-in and meant for GRAPH_DB=off deployments.
+    workers = int(os.getenv("GTNH_API_WORKERS", "1"))
+    if workers > 1 and settings.graph_backend.lower().strip() not in ("off", "none", "duckdb"):
+        raise SystemExit(
+            f"GTNH_API_WORKERS={workers} requires GRAPH_DB=off; "
+            f"GRAPH_DB={settings.graph_backend} can only be opened by one process."
+        )
+    uvicorn.run("app.main:app", host="0.0.0.0", port=port, workers=workers, loop="auto", http="auto")
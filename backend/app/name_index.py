@@ -1,19 +1,135 @@
-import json
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Any
+from typing import Dict, Generic, Hashable, Iterator, List, Tuple, Any, TypeVar
+import hashlib
+import logging
+import os
+import pickle
 import re
+import sys
+import tempfile
+
+import ijson
+
+logger = logging.getLogger("gtnh-api")
 
 ItemKey = Tuple[str, int]
+# (machine_name, min_tier, min_voltage, amps, ebf_temp) from recipes.json. The
+# machine id fallback and tier names come from the dataset row, not the JSON.
+RecipeHeader = Tuple[Any, Any, Any, Any, Any]
+K = TypeVar("K", bound=Hashable)
+
+_NGRAM = 3
+_SEPARATOR = "\x00"
+
+# Caches are rebuilt whenever this module's source changes, so changes to the
+# build logic take effect without a manual bump. _CACHE_FORMAT still covers
+# changes made elsewhere (for example a pickling change in a dependency).
+_CACHE_FORMAT = 6
+_BUILD_SOURCE_HASH = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+_CACHE_SUFFIX = ".name_index.pkl"
+
+# Length of the most-referenced item and fluid lists served for an empty search.
+_TOP_N = 200
+
+_loaded_indexes: Dict[Tuple[Path, Path | None], Tuple[tuple, "NameIndex"]] = {}
+
+
+class SubstringIndex(Generic[K]):
+    # Trigram inverted index over lowercased names. A substring query only has to
+    # verify the keys in the shortest posting list of its trigrams instead of
+    # scanning every name; queries shorter than a trigram fall back to a scan.
+    def __init__(self, lower: Dict[K, str]) -> None:
+        self.lower = lower
+        self._postings: Dict[str, List[K]] = {}
+        for key, name in self.lower.items():
+            for gram in {name[i : i + _NGRAM] for i in range(len(name) - _NGRAM + 1)}:
+                self._postings.setdefault(gram, []).append(key)
+        # Short queries have no trigram to look up; they are answered with str.find
+        # over all names joined by a separator, mapping hit offsets back to keys.
+        self._keys = list(lower)
+        self._starts: List[int] = []
+        offset = 0
+        for name in lower.values():
+            self._starts.append(offset)
+            offset += len(name) + 1
+        self._haystack = _SEPARATOR.join(lower.values())
+
+    def search(self, query: str) -> Iterator[K]:
+        # Expects an already lowercased query.
+        lower = self.lower
+        if len(query) < _NGRAM:
+            yield from self._scan(query)
+            return
+        candidates: List[K] | None = None
+        for gram in {query[i : i + _NGRAM] for i in range(len(query) - _NGRAM + 1)}:
+            posting = self._postings.get(gram)
+            if not posting:
+                return
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        for key in candidates or ():
+            if query in lower[key]:
+                yield key
+
+    def _scan(self, query: str) -> Iterator[K]:
+        if _SEPARATOR in query:
+            return
+        if not query:
+            yield from self._keys
+            return
+        haystack = self._haystack
+        starts = self._starts
+        keys = self._keys
+        last = len(keys) - 1
+        pos = haystack.find(query)
+        while pos != -1:
+            index = bisect_right(starts, pos) - 1
+            yield keys[index]
+            if index == last:
+                return
+            pos = haystack.find(query, starts[index + 1])
+
+
+class PrefixIndex(Generic[K]):
+    # Lowercased names kept sorted so a prefix query is a bisect to the first
+    # match followed by a walk over the contiguous run of matches.
+    def __init__(self, lower: Dict[K, str]) -> None:
+        entries = sorted(lower.items(), key=lambda entry: entry[1])
+        self._names = [name for _, name in entries]
+        self._keys = [key for key, _ in entries]
+
+    def search(self, prefix: str) -> Iterator[K]:
+        # Expects an already lowercased prefix.
+        names = self._names
+        keys = self._keys
+        index = bisect_left(names, prefix)
+        end = len(names)
+        while index < end and names[index].startswith(prefix):
+            yield keys[index]
+            index += 1
 
 
 @dataclass
 class NameIndex:
     items: Dict[ItemKey, str]
+    items_by_id: Dict[str, Dict[int, str]]
     fluids: Dict[str, str]
     recipes: Dict[str, Dict[str, Any]]
     machine_names: Dict[str, str]
     machine_names_by_tier: Dict[str, Dict[str, str]]
+    recipe_headers: Dict[str, RecipeHeader]
+    items_lower: Dict[ItemKey, str]
+    fluids_lower: Dict[str, str]
+    item_search: SubstringIndex[ItemKey]
+    fluid_search: SubstringIndex[str]
+    item_prefix: PrefixIndex[ItemKey]
+    fluid_prefix: PrefixIndex[str]
+    top_items: List[ItemKey]
+    top_fluids: List[str]
 
 
 _TIER_ORDER = [
@@ -33,11 +149,16 @@ _TIER_ORDER = [
 ]
 
 
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+_TIER_RE = re.compile(r"tier\.(\d+)")
+
+
+@lru_cache(maxsize=1024)
 def _title_from_recipe_map(name: str) -> str:
     if name.endswith("Recipes"):
         name = name[: -len("Recipes")]
     name = name.replace("_", " ")
-    name = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", name)
+    name = _CAMEL_RE.sub(r"\1 \2", name)
     titled = " ".join(word.capitalize() for word in name.split())
     if titled == "Blast Furnace":
         return "Electric Blast Furnace"
@@ -47,7 +168,7 @@ def _title_from_recipe_map(name: str) -> str:
 def _parse_machine_tier(meta_tile_name: str | None) -> str | None:
     if not meta_tile_name:
         return None
-    match = re.search(r"tier\.(\d+)", meta_tile_name)
+    match = _TIER_RE.search(meta_tile_name)
     if not match:
         return None
     tier_num = int(match.group(1))
@@ -63,29 +184,135 @@ def _parse_machine_tier(meta_tile_name: str | None) -> str | None:
 def _load_machine_names(machine_index_json: Path) -> tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
     if not machine_index_json.exists():
         return {}, {}
-    with machine_index_json.open("r", encoding="utf-8") as f:
-        data = json.load(f)
     names: Dict[str, str] = {}
     names_by_tier: Dict[str, Dict[str, str]] = {}
-    for entry in data.get("machineIndex", []):
-        machine_id = entry.get("machineId")
-        display_name = entry.get("displayName")
-        if not machine_id or not display_name:
-            continue
-        if machine_id not in names:
-            names[machine_id] = display_name
-        tier = _parse_machine_tier(entry.get("metaTileName"))
-        if tier:
-            names_by_tier.setdefault(machine_id, {})[tier] = display_name
+    with machine_index_json.open("rb") as f:
+        for entry in ijson.items(f, "machineIndex.item", use_float=True):
+            machine_id = entry.get("machineId")
+            display_name = entry.get("displayName")
+            if not machine_id or not display_name:
+                continue
+            if machine_id not in names:
+                names[machine_id] = display_name
+            tier = _parse_machine_tier(entry.get("metaTileName"))
+            if tier:
+                names_by_tier.setdefault(machine_id, {})[tier] = display_name
     return names, names_by_tier
 
 
+def _build_name_index(
+    items: Dict[ItemKey, str],
+    fluids: Dict[str, str],
+    recipes: Dict[str, Dict[str, Any]],
+    machine_names: Dict[str, str],
+    machine_names_by_tier: Dict[str, Dict[str, str]],
+    item_refs: Counter,
+    fluid_refs: Counter,
+) -> NameIndex:
+    # Per-row enrichment looks names up by id then meta, which avoids building a
+    # (item_id, meta) tuple for every io row of every response.
+    items_by_id: Dict[str, Dict[int, str]] = {}
+    for (item_id, meta), name in items.items():
+        items_by_id.setdefault(item_id, {})[meta] = name
+    # Recipe response fields that only depend on the rid, resolved once here.
+    recipe_headers: Dict[str, RecipeHeader] = {}
+    for rid, info in recipes.items():
+        recipe_headers[rid] = (
+            info["machine_name"],
+            info["min_tier"],
+            info["min_voltage"],
+            info["amps"],
+            info["ebf_temp"],
+        )
+    # Lowercase once at load time; search handlers compare against these directly.
+    items_lower = {key: name.lower() for key, name in items.items()}
+    fluids_lower = {key: name.lower() for key, name in fluids.items()}
+    return NameIndex(
+        items=items,
+        items_by_id=items_by_id,
+        fluids=fluids,
+        recipes=recipes,
+        machine_names=machine_names,
+        machine_names_by_tier=machine_names_by_tier,
+        recipe_headers=recipe_headers,
+        items_lower=items_lower,
+        fluids_lower=fluids_lower,
+        item_search=SubstringIndex(items_lower),
+        fluid_search=SubstringIndex(fluids_lower),
+        item_prefix=PrefixIndex(items_lower),
+        fluid_prefix=PrefixIndex(fluids_lower),
+        top_items=[key for key, _ in item_refs.most_common(_TOP_N)],
+        top_fluids=[key for key, _ in fluid_refs.most_common(_TOP_N)],
+    )
+
+
+def _source_stamp(*paths: Path | None) -> tuple:
+    stamp: list = [_CACHE_FORMAT, _BUILD_SOURCE_HASH]
+    for path in paths:
+        if path is not None and path.exists():
+            stat = path.stat()
+            stamp.append((str(path), stat.st_mtime_ns, stat.st_size))
+        else:
+            stamp.append((str(path), None, None))
+    return tuple(stamp)
+
+
 def load_name_index(recipes_json: Path, machine_index_json: Path | None = None) -> NameIndex:
+    # Repeat loads in one process (app startup under test clients, reloads) share
+    # the already built index as long as the sources are unchanged.
+    cache_path = recipes_json.with_name(recipes_json.name + _CACHE_SUFFIX)
+    stamp = _source_stamp(recipes_json, machine_index_json)
+    loaded = _loaded_indexes.get((recipes_json, machine_index_json))
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+    index = _load_or_build(cache_path, stamp, recipes_json, machine_index_json)
+    _loaded_indexes[(recipes_json, machine_index_json)] = (stamp, index)
+    return index
+
+
+def _load_or_build(
+    cache_path: Path, stamp: tuple, recipes_json: Path, machine_index_json: Path | None
+) -> NameIndex:
+    # The built index (including the search indexes) is pickled next to
+    # recipes.json and reused while both source files are unchanged.
+    try:
+        with cache_path.open("rb") as f:
+            cached_stamp, index = pickle.load(f)
+        if cached_stamp == stamp:
+            return index
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.warning("Ignoring unreadable name index cache %s", cache_path)
+
+    index = _build_from_sources(recipes_json, machine_index_json)
+    if recipes_json.exists():
+        # Each worker builds at startup, so every writer gets its own temp file.
+        tmp_path: Path | None = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = Path(f.name)
+                pickle.dump((stamp, index), f, protocol=5)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            # The cache is only an optimization; a failed write must not stop startup.
+            logger.warning("Could not write name index cache %s", cache_path, exc_info=True)
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+    return index
+
+
+def _build_from_sources(recipes_json: Path, machine_index_json: Path | None) -> NameIndex:
     items: Dict[ItemKey, str] = {}
     fluids: Dict[str, str] = {}
     recipes: Dict[str, Dict[str, Any]] = {}
     machine_names: Dict[str, str] = {}
     machine_names_by_tier: Dict[str, Dict[str, str]] = {}
+    # How many recipe io entries reference each named item and fluid.
+    item_refs: Counter = Counter()
+    fluid_refs: Counter = Counter()
 
     if machine_index_json is not None:
         names, names_by_tier = _load_machine_names(machine_index_json)
@@ -93,51 +320,47 @@ def load_name_index(recipes_json: Path, machine_index_json: Path | None = None)
         machine_names_by_tier.update(names_by_tier)
 
     if not recipes_json.exists():
-        return NameIndex(
-            items=items,
-            fluids=fluids,
-            recipes=recipes,
-            machine_names=machine_names,
-            machine_names_by_tier=machine_names_by_tier,
+        return _build_name_index(
+            items, fluids, recipes, machine_names, machine_names_by_tier, item_refs, fluid_refs
         )
 
-    # NOTE: this loads the full JSON; keep it simple for now.
-    with recipes_json.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    for recipe_map in data.get("recipeMaps", []):
-        display_name = recipe_map.get("displayName") or ""
-        machine_id = recipe_map.get("machineId")
-        pretty_name = _title_from_recipe_map(display_name) if display_name else None
-        if machine_id and pretty_name and machine_id not in machine_names:
-            machine_names.setdefault(machine_id, pretty_name)
-        for recipe in recipe_map.get("recipes", []):
-            rid = recipe.get("rid")
-            if rid:
-                recipes[rid] = {
-                    "machine_id": recipe.get("machineId"),
-                    "machine_name": machine_names.get(recipe.get("machineId")),
-                    "min_tier": recipe.get("minTier"),
-                    "min_voltage": recipe.get("minVoltage"),
-                    "amps": recipe.get("ampsAtMinTier"),
-                    "ebf_temp": recipe.get("ebfTemp"),
-                }
-            for entry in recipe.get("itemInputs", []) + recipe.get("itemOutputs", []):
-                item_id = entry.get("id")
-                meta = entry.get("meta", 0)
-                name = entry.get("displayName")
-                if item_id and name:
-                    items.setdefault((item_id, int(meta)), name)
-            for entry in recipe.get("fluidInputs", []) + recipe.get("fluidOutputs", []):
-                fluid_id = entry.get("id")
-                name = entry.get("displayName") or entry.get("localizedName")
-                if fluid_id and name:
-                    fluids.setdefault(fluid_id, name)
+    # Stream recipe maps one at a time instead of materializing the whole document.
+    with recipes_json.open("rb") as f:
+        for recipe_map in ijson.items(f, "recipeMaps.item", use_float=True):
+            display_name = recipe_map.get("displayName") or ""
+            machine_id = recipe_map.get("machineId")
+            pretty_name = _title_from_recipe_map(display_name) if display_name else None
+            if machine_id and pretty_name and machine_id not in machine_names:
+                machine_names[machine_id] = pretty_name
+            for recipe in recipe_map.get("recipes", []):
+                rid = recipe.get("rid")
+                if rid:
+                    recipes[rid] = {
+                        "machine_id": recipe.get("machineId"),
+                        "machine_name": machine_names.get(recipe.get("machineId")),
+                        "min_tier": recipe.get("minTier"),
+                        "min_voltage": recipe.get("minVoltage"),
+                        "amps": recipe.get("ampsAtMinTier"),
+                        "ebf_temp": recipe.get("ebfTemp"),
+                    }
+                for entry in recipe.get("itemInputs", []) + recipe.get("itemOutputs", []):
+                    item_id = entry.get("id")
+                    meta = entry.get("meta", 0)
+                    name = entry.get("displayName")
+                    if item_id and name:
+                        # Item ids repeat across thousands of recipes; share one object.
+                        key = (sys.intern(item_id), int(meta))
+                        if key not in items:
+                            items[key] = name
+                        item_refs[key] += 1
+                for entry in recipe.get("fluidInputs", []) + recipe.get("fluidOutputs", []):
+                    fluid_id = entry.get("id")
+                    name = entry.get("displayName") or entry.get("localizedName")
+                    if fluid_id and name:
+                        if fluid_id not in fluids:
+                            fluids[fluid_id] = name
+                        fluid_refs[fluid_id] += 1
 
-    return NameIndex(
-        items=items,
-        fluids=fluids,
-        recipes=recipes,
-        machine_names=machine_names,
-        machine_names_by_tier=machine_names_by_tier,
+    return _build_name_index(
+        items, fluids, recipes, machine_names, machine_names_by_tier, item_refs, fluid_refs
     )